@@ -7,6 +7,14 @@ from .extensions import db, migrate
 from .extensions import bcrypt, jwt
 from .routes import register_blueprints
 from .common import register_error_handlers
+from .commands import register_commands
+from . import search
+from .common import json_provider
+from .common.cache import reference_cache
+from .common.hashing import password_hashing
+from .common.instrumentation import sql_instrumentation
+from .common.metrics import metrics
+from .common.compression import compression
 
 load_dotenv()
 
@@ -14,16 +22,23 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(get_config(config_name))
 
-    app.json.sort_keys = False
+    json_provider.init_app(app)
 
     # Enable CORS  
     CORS(app)
 
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, include_object=search.include_object)
     bcrypt.init_app(app)
     jwt.init_app(app)
+    search.init_app(app)
+    reference_cache.init_app(app)
+    password_hashing.init_app(app)
+    sql_instrumentation.init_app(app)
+    metrics.init_app(app)
+    # After the instrumentation and metrics, so its hook runs before theirs.
+    compression.init_app(app)
     
     # Register error handlers
     register_error_handlers(app)
@@ -31,4 +46,7 @@ def create_app(config_name=None):
     # Register blueprints
     register_blueprints(app)
 
+    # Register CLI commands
+    register_commands(app)
+
     return app
@@ -0,0 +1,108 @@
+import logging
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from .extensions import db
+from .services import (
+    book_service, google_books_service, job_service, reminder_service, report_service, reservation_service
+)
+from .search import install_search_index
+
+books_cli = AppGroup('books', help='Book catalog maintenance commands.')
+search_cli = AppGroup('search', help='Catalog search index commands.')
+reports_cli = AppGroup('reports', help='Reporting rollup commands.')
+jobs_cli = AppGroup('jobs', help='Background job queue commands.')
+
+
+@books_cli.command('reconcile-copies')
+@click.option('--dry-run', is_flag=True, help='Report drift without fixing it.')
+def reconcile_copies(dry_run):
+    """Recompute available_copies from borrows and report any drift."""
+    drift = book_service.reconcile_available_copies(fix=not dry_run)
+    if not drift:
+        click.echo('available_copies is in sync for all books.')
+        return
+
+    for row in drift:
+        click.echo(f"{row['isbn']}: stored={row['stored']} expected={row['expected']}")
+    action = 'Found' if dry_run else 'Fixed'
+    click.echo(f'{action} drift on {len(drift)} book(s).')
+
+
+@books_cli.command('import-isbns')
+@click.argument('isbn_file', type=click.File('r'))
+@click.option('--copies', default=1, show_default=True, help='Copies to record for each imported book.')
+def import_isbns(isbn_file, copies):
+    """Import books for the ISBNs listed in ISBN_FILE (one per line)."""
+    isbns = [line.strip() for line in isbn_file if line.strip()]
+    report = google_books_service.import_books_by_isbn(isbns, total_copies=copies)
+    for error in report['errors']:
+        click.echo(f"{error['isbn']}: {error['error']}")
+    click.echo(f"Imported {report['created']} of {report['total']} book(s).")
+
+
+@search_cli.command('init')
+@click.option('--rebuild', is_flag=True, help='Repopulate the index from the books table.')
+def init_search(rebuild):
+    """Create the catalog search indexes if they are missing."""
+    with db.engine.begin() as connection:
+        install_search_index(connection, rebuild=rebuild)
+    click.echo('Search index is ready.')
+
+
+@reports_cli.command('backfill')
+def backfill_reports():
+    """Rebuild the daily report rollups from the full borrow history."""
+    counts = report_service.backfill_rollups()
+    for table, rows in counts.items():
+        click.echo(f'{table}: {rows} row(s)')
+
+
+@jobs_cli.command('worker')
+@click.option('--burst', is_flag=True, help='Exit once the queue is empty.')
+def jobs_worker(burst):
+    """Run queued jobs (reminder notifications)."""
+    logging.basicConfig(level=logging.INFO)
+    processed = job_service.run_worker(burst=burst)
+    click.echo(f'Processed {processed} job(s).')
+
+
+@jobs_cli.command('scan-reminders')
+def scan_reminders():
+    """Queue due-soon and overdue reminders once."""
+    created = reminder_service.scan_borrows()
+    for kind, count in created.items():
+        click.echo(f'{kind}: {count} job(s) queued')
+
+
+@jobs_cli.command('expire-holds')
+def expire_holds():
+    """Expire reservation holds that were not picked up and pass the copies on."""
+    result = reservation_service.expire_holds()
+    click.echo(f"Expired {result['expired']} hold(s), made {result['held']} new hold(s).")
+
+
+@jobs_cli.command('scheduler')
+@click.option('--interval', type=int, default=None, help='Seconds between scans (default REMINDER_SCAN_INTERVAL).')
+def jobs_scheduler(interval):
+    """Scan for reminders and expired holds every interval; running several schedulers is safe."""
+    logging.basicConfig(level=logging.INFO)
+    interval = interval or current_app.config['REMINDER_SCAN_INTERVAL']
+    while True:
+        started = time.monotonic()
+        try:
+            reminder_service.scan_borrows()
+            reservation_service.expire_holds()
+            job_service.purge_finished(current_app.config['JOB_RETENTION_DAYS'])
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception('Reminder scan failed')
+        time.sleep(max(interval - (time.monotonic() - started), 0))
+
+
+def register_commands(app):
+    app.cli.add_command(books_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(jobs_cli)
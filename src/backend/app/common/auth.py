@@ -1,33 +1,46 @@
 from functools import wraps
 from flask import request
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
 from werkzeug.exceptions import Forbidden, Unauthorized
-from ..models.user import User
+from ..services.user_service import get_cached_user
 
 def get_current_user():
     verify_jwt_in_request()
     identity = get_jwt_identity()
     if not identity:
         raise Unauthorized('Missing identity')
-    
-    user = User.query.get(identity)
+
+    user = get_cached_user(identity)
     if not user:
         raise Unauthorized('User not found')
-    
+
+    # Tokens issued before a role or password change are no longer valid
+    if get_jwt().get('token_version', 0) != (user.token_version or 0):
+        raise Unauthorized('Token has been revoked')
+
     return user
 
 
 def role_required(*allowed_roles):
+    """Check the caller's role from the JWT claims against the cached user row.
+
+    The token's token_version is compared with the user's, as in
+    get_current_user, so demoting a user, changing their password or
+    deleting them revokes their tokens here too. The row comes from the user
+    cache, which is invalidated only in the worker that made the change:
+    other worker processes keep accepting the old token for up to
+    CACHE_TTL_USERS seconds.
+    Tokens minted before the role claim existed use the role of the row.
+    """
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             user = get_current_user()
-            user_role = str(user.role)
+            user_role = get_jwt().get('role')
+            if user_role is None:
+                user_role = str(user.role)
             if user_role not in allowed_roles:
                 raise Forbidden('Insufficient permissions')
             return fn(*args, **kwargs)
         return wrapper
     return decorator
-
-
-
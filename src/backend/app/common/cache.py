@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ReferenceCache:
+    """Small in-process read-through cache for rarely changing reference data.
+
+    Entries live under a namespace ('authors', 'categories', 'books') that has
+    its own TTL. The whole cache is bounded by ``max_entries`` and evicts the
+    least recently used entry first. Each worker process keeps its own copy,
+    so writes made through another process become visible when the TTL runs
+    out, or as soon as the caller passes a newer ``version``.
+    """
+
+    def __init__(self, max_entries=1024, ttls=None):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('CACHE_MAX_ENTRIES', self.max_entries)
+        self.ttls.update(app.config.get('CACHE_TTLS', {}))
+        self.clear()
+
+    def get_or_load(self, namespace, key, loader, version=None):
+        """Return the cached value, calling ``loader()`` on a miss.
+
+        An entry stored with a different ``version`` counts as a miss.
+        ``None`` results are not cached so that lookups for missing rows do
+        not fill the cache.
+        """
+        ttl = self.ttls.get(namespace, 0)
+        if ttl <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None and entry[0] > now and entry[2] == version:
+                self._entries.move_to_end((namespace, key))
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                self._entries[(namespace, key)] = (now + ttl, value, version)
+                self._entries.move_to_end((namespace, key))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, namespace, key=None):
+        """Drop one entry, or every entry of the namespace when key is None."""
+        with self._lock:
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+                return
+            for cached in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[cached]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'ttls': dict(self.ttls),
+            }
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,201 @@
+import gzip
+import logging
+import time
+import zlib
+from flask import g, request
+from .metrics import metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+    'image/svg+xml',
+}
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        # Sync-flush every chunk so a streamed export reaches the client as it is produced.
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def process(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def process(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class Codec:
+    """One content coding: a one-shot compressor and a streaming one."""
+
+    def __init__(self, name, module, compress, stream):
+        self.name = name
+        self.available = module is not None
+        self.compress = compress
+        self.stream = stream
+
+
+CODECS = {
+    'zstd': Codec(
+        'zstd', zstandard,
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), _ZstdStream
+    ),
+    'br': Codec('br', brotli, lambda data, level: brotli.compress(data, quality=level), _BrotliStream),
+    'gzip': Codec('gzip', gzip, lambda data, level: gzip.compress(data, level, mtime=0), _GzipStream),
+}
+
+
+class Compression:
+    """Negotiated zstd, brotli or gzip compression of responses.
+
+    The coding is picked from the request's Accept-Encoding, preferring
+    ``COMPRESSION_ALGORITHMS`` order on equal quality. Buffered bodies under
+    ``COMPRESSION_MIN_SIZE`` bytes, bodies that do not shrink, responses that
+    already carry a Content-Encoding and non-text types are sent as they are.
+    Streamed responses are compressed chunk by chunk. The bytes in and out
+    and the CPU time spent go to the Prometheus metrics and, for buffered
+    responses, to the SQL instrumentation's Server-Timing header.
+    """
+
+    def __init__(self):
+        self.min_size = 1024
+        self.levels = {}
+        self.encodings = []
+
+    def init_app(self, app):
+        if not app.config.get('COMPRESSION_ENABLED', True):
+            return
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', self.min_size)
+        self.levels = {
+            'gzip': app.config.get('COMPRESSION_GZIP_LEVEL', 6),
+            'br': app.config.get('COMPRESSION_BROTLI_LEVEL', 4),
+            'zstd': app.config.get('COMPRESSION_ZSTD_LEVEL', 3),
+        }
+        self.encodings = []
+        for name in app.config.get('COMPRESSION_ALGORITHMS', 'zstd,br,gzip').split(','):
+            name = name.strip()
+            if not name:
+                continue
+            if name not in CODECS:
+                raise ValueError(f"Unknown compression algorithm '{name}'")
+            if CODECS[name].available:
+                self.encodings.append(name)
+            else:
+                logger.info(f"Compression algorithm '{name}' skipped: its package is not installed")
+        # Registered after the instrumentation so it runs before it (after_request runs in reverse).
+        app.after_request(self._compress)
+
+    def _negotiate(self):
+        accepted = request.accept_encodings
+        best, best_quality = None, 0
+        for name in self.encodings:
+            quality = accepted.quality(name)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    @staticmethod
+    def _compressible(response):
+        if request.method == 'HEAD' or not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+            return False
+        if response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return False
+        if response.cache_control.no_transform:
+            return False
+        mimetype = response.mimetype or ''
+        return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+    def _compress(self, response):
+        if not self._compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self._negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            started = time.thread_time()
+            body = CODECS[encoding].compress(data, self.levels[encoding])
+            seconds = time.thread_time() - started
+            if len(body) >= len(data):
+                return response
+            response.set_data(body)
+            g.compression = {'encoding': encoding, 'input': len(data), 'output': len(body), 'seconds': seconds}
+            metrics.observe_compression(encoding, len(data), len(body), seconds)
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # A strong validator names exact bytes, so each coding needs its own.
+            response.set_etag(f'{etag}-{encoding}')
+        return response
+
+    def _stream(self, source, encoding):
+        compressor = CODECS[encoding].stream(self.levels[encoding])
+        size_in = size_out = 0
+        seconds = 0.0
+        try:
+            for chunk in source:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                if not chunk:
+                    continue
+                started = time.thread_time()
+                compressed = compressor.process(chunk)
+                seconds += time.thread_time() - started
+                size_in += len(chunk)
+                size_out += len(compressed)
+                if compressed:
+                    yield compressed
+            started = time.thread_time()
+            tail = compressor.finish()
+            seconds += time.thread_time() - started
+            size_out += len(tail)
+            if tail:
+                yield tail
+        finally:
+            # Closing the original iterable ends stream_with_context's request context.
+            if hasattr(source, 'close'):
+                source.close()
+            metrics.observe_compression(encoding, size_in, size_out, seconds)
+
+
+compression = Compression()
@@ -0,0 +1,76 @@
+import hashlib
+from functools import wraps
+from flask import current_app, g, has_request_context, make_response, request
+from ..models.table_version import VERSIONED_TABLES, get_versions
+from .dates import as_utc
+from .replica import replica_reads
+
+
+def _cache_control():
+    policies = current_app.config.get('HTTP_CACHE_CONTROL', {})
+    return policies.get(request.blueprint, policies.get('default'))
+
+
+def validated_versions():
+    """The table versions the current response's ETag is built from, or None.
+
+    Cached bodies are stored with these and reused only while they match, so
+    a worker never sends a body older than the ETag it labels it with.
+    """
+    if not has_request_context():
+        return None
+    return g.get('validated_versions')
+
+
+def conditional_get(*tables):
+    """Answer GETs with ETag/Last-Modified derived from table versions.
+
+    The validators are computed from the ``table_versions`` rows of every
+    table the response is built from, so a matching ``If-None-Match`` (or
+    ``If-Modified-Since``) returns 304 before the view runs at all. The
+    versions are read where the views' read_only queries go, the replica
+    when it is in use, so a lagging replica's body is never labelled with
+    the primary's newer version.
+    """
+    unversioned = set(tables) - VERSIONED_TABLES
+    if unversioned:
+        raise ValueError(f"Tables without versions: {', '.join(sorted(unversioned))}")
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with replica_reads():
+                versions = get_versions(tables)
+            g.validated_versions = tuple(versions[name][0] for name in tables)
+            fingerprint = request.full_path + '|' + ','.join(
+                f'{name}:{versions[name][0]}' for name in tables
+            )
+            etag = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:20]
+            stamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+            last_modified = max(as_utc(stamp) for stamp in stamps) if stamps else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = (
+                    since is not None and last_modified is not None
+                    and last_modified.replace(microsecond=0) <= as_utc(since)
+                )
+
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            cache_control = _cache_control()
+            if cache_control:
+                response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+
+
+def as_utc(value):
+    """Return an aware UTC datetime; naive values (SQLite) are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_datetime(value, name):
+    """Parse an ISO 8601 query parameter into an aware UTC datetime."""
+    if value is None:
+        return None
+    try:
+        return as_utc(datetime.fromisoformat(value))
+    except ValueError:
+        raise ValueError(f"'{name}' must be an ISO 8601 date or datetime")
@@ -13,9 +13,15 @@ def handle_http_exception(e):
         "description": e.description,
     }
     if 400 <= e.code < 500:
-        return jsend_fail(payload, status_code=e.code)
+        response = jsend_fail(payload, status_code=e.code)
     else:
-        return jsend_error(e.description or e.name, code=e.code, data=payload, status_code=e.code)
+        response = jsend_error(e.description or e.name, code=e.code, data=payload, status_code=e.code)
+
+    # Keep headers such as Retry-After or WWW-Authenticate set by the exception
+    for name, value in e.get_headers():
+        if name.lower() != 'content-type':
+            response.headers[name] = value
+    return response
 
 
 @errors_bp.errorhandler(ValueError)
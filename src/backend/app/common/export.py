@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from datetime import datetime
+from flask import Response, request, stream_with_context
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Rows are buffered into chunks of this size before being written out
+CHUNK_ROWS = 500
+
+
+def requested_export_format():
+    """Return 'ndjson' or 'csv' when the client asked for a streamed export.
+
+    ``?format=`` wins over the Accept header; plain JSON clients get None.
+    """
+    fmt = request.args.get('format', type=str)
+    if fmt:
+        fmt = fmt.lower()
+        if fmt == 'json':
+            return None
+        if fmt not in EXPORT_MIMETYPES:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+        return fmt
+
+    best = request.accept_mimetypes.best_match(['application/json', *EXPORT_MIMETYPES.values()])
+    for fmt, mimetype in EXPORT_MIMETYPES.items():
+        if best == mimetype:
+            return fmt
+    return None
+
+
+def _encode_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson_chunks(rows):
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps({k: _encode_value(v) for k, v in row.items()}, separators=(',', ':')))
+        if len(buffer) >= CHUNK_ROWS:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def _csv_chunks(rows, fieldnames):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+    pending = 0
+    for row in rows:
+        writer.writerow([_encode_value(row[name]) for name in fieldnames])
+        pending += 1
+        if pending >= CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def stream_rows(rows, fmt, fieldnames, filename):
+    """Stream an iterable of dicts as NDJSON or CSV without buffering it all."""
+    chunks = _csv_chunks(rows, fieldnames) if fmt == 'csv' else _ndjson_chunks(rows)
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{fmt}'
+    return response
@@ -0,0 +1,38 @@
+from flask import request
+
+
+def requested_fields(allowed):
+    """The fields asked for with ``?fields=a,b``, in ``allowed`` order.
+
+    Returns None when the parameter is absent or empty, meaning every field.
+    Unknown names raise ValueError.
+    """
+    raw = request.args.get('fields', type=str)
+    if raw is None:
+        return None
+    wanted = {name.strip() for name in raw.split(',') if name.strip()}
+    if not wanted:
+        return None
+    unknown = wanted.difference(allowed)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}. Available: {', '.join(allowed)}")
+    return tuple(name for name in allowed if name in wanted)
+
+
+def select_fields(columns, fields):
+    """Labelled column expressions for ``fields`` (all of ``columns`` when None)."""
+    return [columns[name].label(name) for name in (fields or columns)]
+
+
+def with_sort_keys(fields, keys):
+    """``fields`` plus the sort keys keyset pagination needs to read from each row."""
+    if fields is None:
+        return None
+    return fields + tuple(key for key in keys if key not in fields)
+
+
+def trim_rows(rows, fields):
+    """Drop the columns that were selected only to build a cursor."""
+    if fields is None or not rows or len(rows[0]) == len(fields):
+        return rows
+    return [{name: row._mapping[name] for name in fields} for row in rows]
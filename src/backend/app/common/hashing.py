@@ -0,0 +1,49 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.exceptions import ServiceUnavailable
+
+
+class PasswordHashingPool:
+    """Bounded thread pool for bcrypt work.
+
+    Only ``workers`` hashes run at once and at most ``queue_depth`` more may
+    wait; anything beyond that is rejected straight away with a 503 so a
+    login storm cannot tie up every request worker. bcrypt releases the GIL,
+    so the pool threads do not stall the rest of the process.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self.timeout = None
+
+    def init_app(self, app):
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        queue_depth = app.config.get('PASSWORD_HASH_QUEUE_DEPTH', 8)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    def run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailable('Too many authentication requests, please retry shortly', retry_after=1)
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # A hash still waiting for a thread is dropped; one already running finishes in the background.
+            future.cancel()
+            raise ServiceUnavailable('Authentication is taking too long, please retry shortly', retry_after=1)
+
+
+password_hashing = PasswordHashingPool()
@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_PARAM = r'(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)'
+_PARAM_LIST = re.compile(r'\(\s*' + _PARAM + r'(?:\s*,\s*' + _PARAM + r')*\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(statement):
+    """Normalise a statement so that executions differing only in their
+    parameters (including expanded IN lists) share one fingerprint."""
+    normalised = _WHITESPACE.sub(' ', statement).strip()
+    normalised = _PARAM_LIST.sub('(?)', normalised)
+    normalised = _LITERAL.sub('?', normalised)
+    return hashlib.sha1(normalised.encode('utf-8')).hexdigest()[:12], normalised
+
+
+class RequestQueryStats:
+    """Statements run while serving one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.statements = {}
+        self.relationships = {}
+        self.lazy_loads = Counter()
+        self.pending_relationship = None
+
+    def record(self, statement, duration):
+        key, normalised = fingerprint(statement)
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[key] += 1
+        self.statements.setdefault(key, normalised)
+        if self.pending_relationship is not None:
+            self.relationships.setdefault(key, self.pending_relationship)
+            self.pending_relationship = None
+
+    def repeated(self, threshold):
+        return [(key, n) for key, n in self.fingerprints.most_common() if n >= threshold]
+
+
+class SqlInstrumentation:
+    """Opt-in per-request SQL counters built on SQLAlchemy events.
+
+    When ``SQL_INSTRUMENTATION`` is enabled every request gets a statement
+    count, the total time spent in the database and a count per statement
+    fingerprint. They are reported in a ``Server-Timing`` header and a log
+    line, and a statement repeated ``SQL_N_PLUS_ONE_THRESHOLD`` times or
+    more is logged as a probable N+1, naming the lazy-loaded relationship
+    behind it when there is one. Compressed responses also report the
+    compression CPU time and ratio.
+    """
+
+    _listening = False
+
+    def __init__(self):
+        self.threshold = 5
+
+    def init_app(self, app):
+        if not app.config.get('SQL_INSTRUMENTATION'):
+            return
+        self.threshold = app.config.get('SQL_N_PLUS_ONE_THRESHOLD', self.threshold)
+        self._listen()
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    @classmethod
+    def _listen(cls):
+        # The listeners are process-wide and do nothing outside instrumented requests.
+        if cls._listening:
+            return
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Session, 'do_orm_execute', _do_orm_execute)
+        cls._listening = True
+
+    @staticmethod
+    def _start():
+        g.sql_stats = RequestQueryStats()
+
+    def _finish(self, response):
+        stats = g.pop('sql_stats', None)
+        if stats is None:
+            return response
+
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        db_ms = stats.duration * 1000
+        response.headers.add(
+            'Server-Timing', f'db;dur={db_ms:.2f};desc="{stats.count} queries"'
+        )
+        response.headers.add('Server-Timing', f'app;dur={total_ms:.2f}')
+        # Set by the compression hook, which runs before this one.
+        compressed = g.pop('compression', None)
+        if compressed is not None:
+            ratio = compressed['input'] / max(compressed['output'], 1)
+            response.headers.add(
+                'Server-Timing',
+                f'compress;dur={compressed["seconds"] * 1000:.2f};desc="{compressed["encoding"]} {ratio:.1f}x"'
+            )
+
+        route = request.url_rule.rule if request.url_rule else request.path
+        repeated = stats.repeated(self.threshold)
+        logger.info(
+            f"sql route={route} endpoint={request.endpoint} method={request.method} "
+            f"status={response.status_code} queries={stats.count} db_ms={db_ms:.2f} "
+            f"total_ms={total_ms:.2f} repeated={len(repeated)}",
+            extra={'sql': {
+                'route': route, 'endpoint': request.endpoint, 'method': request.method,
+                'status': response.status_code, 'queries': stats.count,
+                'db_ms': round(db_ms, 2), 'total_ms': round(total_ms, 2),
+                'repeated': {key: n for key, n in repeated},
+                'compression': compressed,
+            }}
+        )
+        for key, n in repeated:
+            relationship = stats.relationships.get(key)
+            logger.warning(
+                f"Probable N+1: route={route} method={request.method} "
+                f"relationship={relationship or 'unknown'} executions={n} "
+                f"fingerprint={key} statement={stats.statements[key][:200]}"
+            )
+        return response
+
+
+def _current_stats():
+    if not has_request_context():
+        return None
+    return g.get('sql_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    started = conn.info.get('query_started')
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _do_orm_execute(orm_execute_state):
+    stats = _current_stats()
+    if stats is not None and orm_execute_state.is_relationship_load:
+        relationship = str(orm_execute_state.loader_strategy_path.prop)
+        stats.lazy_loads[relationship] += 1
+        stats.pending_relationship = relationship
+
+
+sql_instrumentation = SqlInstrumentation()
@@ -0,0 +1,123 @@
+import dataclasses
+import decimal
+import enum
+import importlib
+import uuid
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_default(obj):
+    """Encode the types the API returns that JSON has no notation for.
+
+    Datetimes and dates become ISO 8601 strings (the same text as
+    ``isoformat()``), enums their value, and result rows and named tuples
+    objects keyed by column name, so services can return rows as they come
+    from the database.
+    """
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if hasattr(obj, '_asdict'):
+        return obj._asdict()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider with ISO 8601 dates instead of HTTP dates."""
+
+    default = staticmethod(encode_default)
+
+    def dumps(self, obj, **kwargs):
+        # The stdlib encodes tuples as arrays before asking ``default``, so
+        # rows that are tuples have to be turned into objects up front.
+        return super().dumps(_rows_to_dicts(obj), **kwargs)
+
+
+def _rows_to_dicts(obj):
+    if isinstance(obj, dict):
+        return {key: _rows_to_dicts(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if hasattr(obj, '_asdict'):
+            return _rows_to_dicts(obj._asdict())
+        return [_rows_to_dicts(value) for value in obj]
+    if hasattr(obj, '_asdict'):
+        return _rows_to_dicts(obj._asdict())
+    return obj
+
+
+class OrjsonProvider(JSONProvider):
+    """Serializes with orjson, which encodes datetimes, enums and dataclasses in C.
+
+    Output matches StdlibJSONProvider except that non-ASCII text is written
+    as UTF-8 rather than ``\\uXXXX`` escapes. Follows the app's
+    ``sort_keys`` and ``compact`` settings, and like Flask pretty-prints in
+    debug mode.
+    """
+
+    sort_keys = False
+    compact = None
+    mimetype = 'application/json'
+
+    def _options(self, indent=False):
+        # Non-string keys are stringified, as the stdlib does.
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=encode_default, option=self._options()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=encode_default, option=self._options(indent)) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+PROVIDERS = {
+    'orjson': OrjsonProvider,
+    'stdlib': StdlibJSONProvider,
+}
+
+
+def _load_provider_class(name):
+    if name == 'auto':
+        return OrjsonProvider if orjson is not None else StdlibJSONProvider
+    if name == 'orjson' and orjson is None:
+        raise ValueError("JSON_PROVIDER is 'orjson' but orjson is not installed")
+    if name in PROVIDERS:
+        return PROVIDERS[name]
+    module_name, _, class_name = name.partition(':')
+    if not class_name:
+        raise ValueError(f"Unknown JSON provider '{name}'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def init_app(app):
+    """Install the JSON provider named by JSON_PROVIDER.
+
+    The setting is 'auto' (orjson when installed, else the stdlib), 'orjson',
+    'stdlib' or 'package.module:ClassName' for a custom Flask JSONProvider.
+    """
+    provider = _load_provider_class(app.config.get('JSON_PROVIDER', 'auto'))(app)
+    provider.sort_keys = app.config.get('JSON_SORT_KEYS', False)
+    app.json = provider
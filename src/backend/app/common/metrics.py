@@ -0,0 +1,148 @@
+import os
+import time
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def multiprocess_dir():
+    """Directory shared by all worker processes, or None in single-process mode.
+
+    prometheus_client switches to its file-backed value store when this
+    variable is set, so it has to be in the environment before the workers
+    start, and the directory should be emptied whenever the server restarts.
+    """
+    return os.getenv('PROMETHEUS_MULTIPROC_DIR') or None
+
+
+class Metrics:
+    """Request and connection pool metrics in Prometheus text format.
+
+    Requests are counted and timed per blueprint, endpoint and status, with an
+    in-flight gauge per endpoint, and compressed responses add their bytes in
+    and out and CPU time per encoding. Pool gauges are refreshed on every
+    checkout/checkin. Under gunicorn every worker writes its samples to
+    ``PROMETHEUS_MULTIPROC_DIR``, and ``/metrics`` merges the files of all
+    workers, so whichever worker answers the scrape reports the same totals.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._pools = []
+        self.requests = Counter(
+            'quill_http_requests_total', 'HTTP requests handled',
+            ['method', 'blueprint', 'endpoint', 'status']
+        )
+        self.latency = Histogram(
+            'quill_http_request_duration_seconds', 'Time spent handling HTTP requests',
+            ['method', 'blueprint', 'endpoint', 'status'], buckets=LATENCY_BUCKETS
+        )
+        self.in_flight = Gauge(
+            'quill_http_requests_in_flight', 'HTTP requests currently being handled',
+            ['blueprint', 'endpoint'], multiprocess_mode='livesum'
+        )
+        self.pool_size = Gauge(
+            'quill_db_pool_size', 'Configured connection pool size',
+            ['database'], multiprocess_mode='livesum'
+        )
+        self.pool_checked_out = Gauge(
+            'quill_db_pool_checked_out', 'Connections currently checked out of the pool',
+            ['database'], multiprocess_mode='livesum'
+        )
+        self.pool_overflow = Gauge(
+            'quill_db_pool_overflow', 'Connections open beyond the pool size',
+            ['database'], multiprocess_mode='livesum'
+        )
+        self.compression_input = Counter(
+            'quill_http_compression_input_bytes_total', 'Response bytes before compression', ['encoding']
+        )
+        self.compression_output = Counter(
+            'quill_http_compression_output_bytes_total', 'Response bytes after compression', ['encoding']
+        )
+        self.compression_cpu = Counter(
+            'quill_http_compression_cpu_seconds_total', 'CPU time spent compressing responses', ['encoding']
+        )
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        self.enabled = True
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+        app.add_url_rule('/metrics', 'metrics', self.export, methods=['GET'])
+
+        from ..extensions import db
+        with app.app_context():
+            for bind_key, engine in db.engines.items():
+                self.watch_pool(engine, bind_key or 'default')
+
+    def watch_pool(self, engine, name):
+        pool = engine.pool
+
+        def refresh(returning=0):
+            self.pool_size.labels(name).set(pool.size() if hasattr(pool, 'size') else 0)
+            self.pool_checked_out.labels(name).set(
+                max(pool.checkedout() - returning, 0) if hasattr(pool, 'checkedout') else 0
+            )
+            self.pool_overflow.labels(name).set(max(pool.overflow(), 0) if hasattr(pool, 'overflow') else 0)
+
+        # The checkin event fires before the connection is back in the pool.
+        event.listen(engine, 'checkout', lambda *args: refresh())
+        event.listen(engine, 'checkin', lambda *args: refresh(returning=1))
+        # No initial refresh: with a preloading server this runs in the master,
+        # and samples written there would outlive the cleanup in on_starting.
+        self._pools.append(refresh)
+
+    @staticmethod
+    def _labels():
+        return request.blueprint or 'none', request.endpoint or 'unmatched'
+
+    def _start(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_labels = self._labels()
+        self.in_flight.labels(*g.metrics_labels).inc()
+
+    def _finish(self, response):
+        started = g.get('metrics_started')
+        if started is not None:
+            labels = (request.method, *g.metrics_labels, str(response.status_code))
+            self.requests.labels(*labels).inc()
+            self.latency.labels(*labels).observe(time.perf_counter() - started)
+        return response
+
+    def _teardown(self, exc):
+        labels = g.pop('metrics_labels', None)
+        if labels is not None:
+            self.in_flight.labels(*labels).dec()
+
+    def observe_compression(self, encoding, size_in, size_out, seconds):
+        if not self.enabled:
+            return
+        self.compression_input.labels(encoding).inc(size_in)
+        self.compression_output.labels(encoding).inc(size_out)
+        self.compression_cpu.labels(encoding).inc(seconds)
+
+    def export(self):
+        for refresh in self._pools:
+            refresh()
+        if multiprocess_dir():
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+
+
+def mark_process_dead(pid):
+    """Drop the live gauges of a worker that exited (gunicorn child_exit hook)."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+metrics = Metrics()
@@ -0,0 +1,65 @@
+import importlib
+import json
+import logging
+import os
+import threading
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class LogSender:
+    """Write notifications to the application log."""
+
+    def __init__(self, app):
+        pass
+
+    def send(self, notification):
+        logger.info(
+            f"Notification kind={notification['kind']} to={notification['to']} "
+            f"subject={notification['subject']!r}"
+        )
+
+
+class FileSender:
+    """Append notifications as JSON lines to NOTIFICATION_FILE (for local testing)."""
+
+    def __init__(self, app):
+        self.path = app.config.get('NOTIFICATION_FILE') or os.path.join(app.instance_path, 'notifications.ndjson')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+
+    def send(self, notification):
+        line = json.dumps(notification, default=str)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+SENDERS = {
+    'log': LogSender,
+    'file': FileSender,
+}
+
+
+def _load_sender_class(name):
+    if name in SENDERS:
+        return SENDERS[name]
+    module_name, _, class_name = name.partition(':')
+    if not class_name:
+        raise ValueError(f"Unknown notification sender '{name}'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_sender():
+    """The app's notification sender, chosen by NOTIFICATION_SENDER.
+
+    The setting is 'log', 'file' or 'package.module:ClassName' for a custom
+    sender. A sender is built with the app and has a ``send(notification)``
+    method; raising from ``send`` makes the job retry later.
+    """
+    app = current_app._get_current_object()
+    sender = app.extensions.get('notification_sender')
+    if sender is None:
+        sender = _load_sender_class(app.config.get('NOTIFICATION_SENDER', 'log'))(app)
+        app.extensions['notification_sender'] = sender
+    return sender
@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+
+
+def encode_cursor(values):
+    """Pack the sort key of the last row into an opaque, URL-safe token."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort_columns):
+    """Turn a token from encode_cursor back into typed sort-key values."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(sort_columns):
+        raise ValueError('Invalid cursor')
+
+    decoded = []
+    for column, value in zip(sort_columns, values):
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+
+def keyset_paginate(query, sort_columns, cursor=None, per_page=10, include_total=True):
+    """Seek-based pagination over a unique, ordered set of columns.
+
+    Instead of OFFSET it filters on rows strictly after the cursor's sort key,
+    so every page costs the same no matter how deep it is. The COUNT(*) is only
+    run when include_total is set.
+    """
+    total = query.order_by(None).count() if include_total else None
+
+    query = query.order_by(None).order_by(*sort_columns)
+    if cursor:
+        after = decode_cursor(cursor, sort_columns)
+        query = query.filter(tuple_(*sort_columns) > tuple_(*after))
+
+    rows = query.limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in sort_columns])
+
+    return items, next_cursor, total
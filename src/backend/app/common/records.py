@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from flask import request
+
+CSV_MIMETYPES = ('text/csv', 'application/csv')
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+
+def _ndjson_records(lines):
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield ValueError(f'Invalid JSON on line {line_number}')
+
+
+def _csv_records(stream):
+    for row in csv.DictReader(stream):
+        yield {key.strip(): value for key, value in row.items() if key}
+
+
+def _detect_format(mimetype, filename=None):
+    filename = (filename or '').lower()
+    if mimetype in CSV_MIMETYPES or filename.endswith('.csv'):
+        return 'csv'
+    if mimetype in NDJSON_MIMETYPES or filename.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return 'json'
+
+
+def read_uploaded_records():
+    """Iterate over the records of a JSON array, CSV or NDJSON request.
+
+    The payload may be the raw request body (format taken from Content-Type)
+    or a multipart upload in a ``file`` field (format taken from the part's
+    mimetype or file extension). CSV and NDJSON are read line by line.
+    Records that cannot be parsed are yielded as ValueError instances so the
+    caller can report them per row.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        fmt = _detect_format(upload.mimetype, upload.filename)
+        stream = upload.stream
+    else:
+        fmt = _detect_format(request.mimetype)
+        stream = request.stream
+
+    if fmt == 'json':
+        payload = json.load(stream) if upload is not None else request.get_json(silent=True)
+        if not isinstance(payload, list):
+            raise ValueError('Expected a JSON array of books')
+        return iter(payload)
+
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    return _csv_records(text) if fmt == 'csv' else _ndjson_records(text)
@@ -0,0 +1,86 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = 'replica'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_last_write = 0.0
+
+
+@contextmanager
+def replica_reads():
+    """Send the SELECTs run inside the block to the read replica, if one is configured."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_only(fn):
+    """Run a read-only service function against the read replica."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+class RoutingSession(Session):
+    """``db.session`` that can send reads to the ``replica`` bind.
+
+    Only plain SELECTs issued inside ``replica_reads()`` go to the replica.
+    Everything else, and every read made after this session has written in
+    the current transaction, stays on the primary. For REPLICA_STICKY_SECONDS
+    after any commit with writes in this process, all reads stay on the
+    primary, so a response built right after a write (or a cache refilled
+    right after an invalidation) does not see replication lag. That window
+    is tracked per process: read-your-writes only holds for requests served
+    by the worker that made the write, and other workers may read from the
+    replica until it catches up.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause):
+        if not _replica_reads.get() or REPLICA_BIND not in self._db.engines:
+            return False
+        if clause is not None and not isinstance(clause, Select):
+            return False
+        if self._flushing or self.info.get('wrote') or self.new or self.dirty or self.deleted:
+            return False
+        sticky = current_app.config.get('REPLICA_STICKY_SECONDS', 0)
+        return time.monotonic() - _last_write >= sticky
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_write(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_statement_write(orm_execute_state):
+    # UPDATE/INSERT/DELETE statements run through session.execute() bypass the flush.
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session):
+    global _last_write
+    if session.info.pop('wrote', False):
+        _last_write = time.monotonic()
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('wrote', None)
@@ -0,0 +1,26 @@
+def dialect_insert(dialect_name):
+    """The INSERT construct that supports ON CONFLICT for this dialect, or None."""
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def upsert_increment(executor, table, keys, counters):
+    """Add ``counters`` to the row identified by ``keys``, creating it if needed.
+
+    ``executor`` is a Session or Connection. Runs as a single
+    INSERT ... ON CONFLICT DO UPDATE statement.
+    """
+    insert = dialect_insert(executor.get_bind().dialect.name if hasattr(executor, 'get_bind') else executor.dialect.name)
+    if insert is None:
+        raise NotImplementedError('upsert_increment needs PostgreSQL or SQLite')
+    statement = insert(table).values(**keys, **counters)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: table.c[name] + statement.excluded[name] for name in counters},
+    )
+    executor.execute(statement)
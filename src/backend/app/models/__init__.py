@@ -5,6 +5,12 @@ from .author import Author
 from .category import Category
 from .book import Book
 from .borrow import Borrow
+from .table_version import TableVersion
+from .report import DailyBookStats, DailyCategoryStats, DailyMemberStats
+from .job import Job
+from .reservation import Reservation
 
 
-__all__ = ['User', 'Author', 'Category', 'Book', 'Borrow']
\ No newline at end of file
+__all__ = ['User', 'Author', 'Category', 'Book', 'Borrow', 'TableVersion',
+           'DailyBookStats', 'DailyCategoryStats', 'DailyMemberStats', 'Job',
+           'Reservation']
\ No newline at end of file
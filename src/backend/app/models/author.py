@@ -4,18 +4,27 @@ class Author(db.Model):
     __tablename__ = 'authors'
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
+
+    __table_args__ = (
+        # Serves the case-insensitive name-prefix filter of GET /authors/.
+        db.Index(
+            'ix_authors_name_lower', db.func.lower(name).label('name_lower'),
+            postgresql_ops={'name_lower': 'varchar_pattern_ops'}
+        ),
+    )
 
     books = db.relationship('Book', backref='author', lazy=True)
 
     def __init__(self, name):
         self.name = name
 
-    def to_dict(self):
+    def to_dict(self, books_count):
+        # books_count is counted in SQL by the caller rather than by loading self.books.
         return {
             'id': self.id,
             'name': self.name,
-            'books_count': len(self.books)
+            'books_count': books_count
         }
 
     def __repr__(self):
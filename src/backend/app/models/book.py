@@ -3,15 +3,21 @@ from sqlalchemy.orm import validates
 
 class Book(db.Model):
     __tablename__ = 'books'
+    __table_args__ = (
+        db.Index('ix_books_title_isbn', 'title', 'isbn'),
+    )
 
     isbn = db.Column(db.String(20), primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     cover = db.Column(db.String(500)) 
     total_copies = db.Column(db.Integer, nullable=False, default=1)
+    # Existing rows get 0 when the column is added by a migration; run
+    # `flask books reconcile-copies` after `flask db upgrade` to backfill it.
+    available_copies = db.Column(db.Integer, nullable=False, default=1, server_default='0')
     description = db.Column(db.Text)
 
-    author_id = db.Column(db.Integer, db.ForeignKey('authors.id'), nullable=False)
-    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('authors.id'), nullable=False, index=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False, index=True)
 
     borrows = db.relationship('Borrow', backref='book', lazy=True)
 
@@ -21,15 +27,10 @@ class Book(db.Model):
         self.author_id = author_id
         self.category_id = category_id
         self.total_copies = total_copies
+        self.available_copies = total_copies
         self.cover = cover
         self.description = description
 
-    @property
-    def available_copies(self):
-        """Calculate available copies based on active borrows"""
-        active_borrows = sum(1 for borrow in self.borrows if borrow.return_date is None)
-        return self.total_copies - active_borrows
-
     @property
     def is_available(self):
         return self.available_copies > 0
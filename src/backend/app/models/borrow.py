@@ -1,9 +1,19 @@
 from app.extensions import db
 from datetime import datetime, timedelta, timezone
 from config import Config
+from app.common.dates import as_utc
 
 class Borrow(db.Model):
     __tablename__ = 'borrows'
+    __table_args__ = (
+        db.Index('ix_borrows_due_date_id', 'due_date', 'id'),
+        db.Index('ix_borrows_borrow_date_id', 'borrow_date', 'id'),
+        db.Index(
+            'ix_borrows_overdue', 'due_date', 'id',
+            postgresql_where=db.text('return_date IS NULL'),
+            sqlite_where=db.text('return_date IS NULL')
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -20,30 +30,38 @@ class Borrow(db.Model):
         self.borrow_date = borrow_date or datetime.now(timezone.utc)
         self.due_date = due_date or (self.borrow_date + timedelta(days=Config.BORROWING_LIMIT_DAYS))
 
+    def is_overdue_at(self, now):
+        return self.return_date is None and now > as_utc(self.due_date)
+
+    def days_overdue_at(self, now):
+        if not self.is_overdue_at(now):
+            return 0
+        return (now - as_utc(self.due_date)).days
+
     @property
     def is_overdue(self):
         """Check if the borrow is overdue"""
-        return self.return_date is None and datetime.now(timezone.utc) > self.due_date
+        return self.is_overdue_at(datetime.now(timezone.utc))
 
     @property
     def days_overdue(self):
         """Calculate days overdue"""
-        if not self.is_overdue:
-            return 0
-        return (datetime.now(timezone.utc) - self.due_date).days
+        return self.days_overdue_at(datetime.now(timezone.utc))
 
     def return_book(self):
         """Mark the book as returned"""
         self.return_date = datetime.now(timezone.utc)
 
-    def to_dict(self):
+    def to_dict(self, now=None):
+        """Serialize the borrow; pass ``now`` to share one clock across many rows."""
+        now = now or datetime.now(timezone.utc)
         return {
             'id': self.id,
-            'borrow_date': self.borrow_date.isoformat(),
-            'due_date': self.due_date.isoformat(),
-            'return_date': self.return_date.isoformat() if self.return_date else None,
-            'is_overdue': self.is_overdue,
-            'days_overdue': self.days_overdue,
+            'borrow_date': self.borrow_date,
+            'due_date': self.due_date,
+            'return_date': self.return_date,
+            'is_overdue': self.is_overdue_at(now),
+            'days_overdue': self.days_overdue_at(now),
             'user_id': self.user_id,
             'book_isbn': self.book_isbn,
             'book_title': self.book.title if self.book else None,
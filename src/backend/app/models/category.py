@@ -11,11 +11,12 @@ class Category(db.Model):
     def __init__(self, name):
         self.name = name
 
-    def to_dict(self):
+    def to_dict(self, books_count):
+        # books_count is counted in SQL by the caller rather than by loading self.books.
         return {
             'id': self.id,
             'name': self.name,
-            'books_count': len(self.books)
+            'books_count': books_count
         }
 
     def __repr__(self):
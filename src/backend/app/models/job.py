@@ -0,0 +1,51 @@
+from app.extensions import db
+from datetime import datetime, timezone
+
+
+class Job(db.Model):
+    """A unit of background work, claimed and run by `flask jobs worker`.
+
+    ``dedupe_key`` is unique, so enqueueing the same piece of work twice
+    (for example two scheduler runs finding the same overdue loan) creates a
+    single job.
+    """
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    dedupe_key = db.Column(db.String(200), unique=True, nullable=True)
+
+    status = db.Column(db.String(20), nullable=False, default=PENDING, server_default=PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    max_attempts = db.Column(db.Integer, nullable=False, default=5, server_default='5')
+    last_error = db.Column(db.Text, nullable=True)
+
+    run_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'payload': self.payload,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'run_at': self.run_at.isoformat() if self.run_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.kind} ({self.status})>'
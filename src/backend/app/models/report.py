@@ -0,0 +1,31 @@
+from app.extensions import db
+
+
+class DailyBookStats(db.Model):
+    """Borrows and returns per book per day, maintained as borrows happen."""
+    __tablename__ = 'report_daily_books'
+
+    day = db.Column(db.Date, primary_key=True)
+    book_isbn = db.Column(db.String(20), primary_key=True)
+    borrows = db.Column(db.Integer, nullable=False, default=0)
+    returns = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyCategoryStats(db.Model):
+    """Borrows and returns per category per day."""
+    __tablename__ = 'report_daily_categories'
+
+    day = db.Column(db.Date, primary_key=True)
+    category_id = db.Column(db.Integer, primary_key=True)
+    borrows = db.Column(db.Integer, nullable=False, default=0)
+    returns = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyMemberStats(db.Model):
+    """Borrows and returns per member per day."""
+    __tablename__ = 'report_daily_members'
+
+    day = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    borrows = db.Column(db.Integer, nullable=False, default=0)
+    returns = db.Column(db.Integer, nullable=False, default=0)
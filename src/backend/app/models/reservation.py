@@ -0,0 +1,63 @@
+from app.extensions import db
+from datetime import datetime, timezone
+
+
+class Reservation(db.Model):
+    """A member's place in the queue for a book with no copies on the shelf.
+
+    Waiting reservations are served first come, first served per book. When a
+    copy comes back it is held for the oldest one ('ready') until
+    ``expires_at``; borrowing the book then uses the held copy.
+    """
+    __tablename__ = 'reservations'
+    __table_args__ = (
+        # FIFO queue per book: head lookup and position counts are range scans here.
+        db.Index(
+            'ix_reservations_queue', 'book_isbn', 'created_at', 'id',
+            postgresql_where=db.text("status = 'waiting'"),
+            sqlite_where=db.text("status = 'waiting'")
+        ),
+        # At most one open reservation per member and book.
+        db.Index(
+            'uq_reservations_open', 'user_id', 'book_isbn', unique=True,
+            postgresql_where=db.text("status IN ('waiting', 'ready')"),
+            sqlite_where=db.text("status IN ('waiting', 'ready')")
+        ),
+        db.Index('ix_reservations_ready_expires', 'status', 'expires_at'),
+    )
+
+    WAITING = 'waiting'
+    READY = 'ready'
+    FULFILLED = 'fulfilled'
+    CANCELLED = 'cancelled'
+    EXPIRED = 'expired'
+    OPEN = (WAITING, READY)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    book_isbn = db.Column(db.String(20), db.ForeignKey('books.isbn'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=WAITING, server_default=WAITING)
+
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    ready_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    closed_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    user = db.relationship('User', backref=db.backref('reservations', lazy=True))
+    book = db.relationship('Book', backref=db.backref('reservations', lazy=True))
+
+    def to_dict(self, position=None):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'book_isbn': self.book_isbn,
+            'book_title': self.book.title if self.book else None,
+            'status': self.status,
+            'position': position,
+            'created_at': self.created_at,
+            'ready_at': self.ready_at,
+            'expires_at': self.expires_at
+        }
+
+    def __repr__(self):
+        return f'<Reservation {self.id} {self.book_isbn} by user {self.user_id} ({self.status})>'
@@ -0,0 +1,99 @@
+from app.extensions import db
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.common.upsert import dialect_insert
+
+
+# Only what some conditional_get() validates is versioned: each bump takes a
+# row lock that is held until COMMIT, so versioning busy tables such as
+# borrows would serialize their writers. 'book_copies' versions the
+# available_copies counter separately from the rest of the catalog.
+VERSIONED_TABLES = frozenset({'books', 'book_copies', 'authors', 'categories'})
+
+# Execution option naming the version key a statement bumps instead of its table's.
+VERSION_KEY_OPTION = 'table_version'
+
+
+class TableVersion(db.Model):
+    """Write counter per table, bumped in the same transaction as the write.
+
+    Read endpoints build their ETag/Last-Modified from these rows, so one
+    primary-key lookup tells whether a cached response is still valid.
+    """
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f'<TableVersion {self.name}={self.version}>'
+
+
+def get_versions(names):
+    """Return {name: (version, updated_at)} for the given tables."""
+    rows = db.session.query(TableVersion.name, TableVersion.version, TableVersion.updated_at) \
+        .filter(TableVersion.name.in_(names)).all()
+    found = {name: (version, updated_at) for name, version, updated_at in rows}
+    return {name: found.get(name, (0, None)) for name in names}
+
+
+def bump_versions(connection, names):
+    """Bump the given tables' versions on ``connection``, for writes made outside the ORM."""
+    insert = dialect_insert(connection.dialect.name)
+    if insert is None:
+        return
+    now = datetime.now(timezone.utc)
+    table = TableVersion.__table__
+    for name in sorted(set(names) & VERSIONED_TABLES):
+        statement = insert(table).values(name=name, version=1, updated_at=now)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={'version': table.c.version + 1, 'updated_at': now},
+        )
+        connection.execute(statement)
+
+
+def _touched(session):
+    return session.info.setdefault('touched_tables', set())
+
+
+def _tracked_table(table):
+    name = getattr(table, 'name', None)
+    return name if name in VERSIONED_TABLES else None
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        name = _tracked_table(getattr(obj, '__table__', None))
+        if name:
+            _touched(session).add(name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_statement_tables(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        name = orm_execute_state.execution_options.get(VERSION_KEY_OPTION)
+        if name not in VERSIONED_TABLES:
+            name = _tracked_table(getattr(orm_execute_state.statement, 'table', None))
+        if name:
+            _touched(orm_execute_state.session).add(name)
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_versions(session):
+    # Flush first so the final flush's tables are known, then bump right
+    # before COMMIT to keep the version rows locked as briefly as possible.
+    session.flush()
+    touched = session.info.pop('touched_tables', None)
+    if touched:
+        bump_versions(session.connection(), touched)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_versions(session):
+    session.info.pop('touched_tables', None)
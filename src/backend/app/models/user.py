@@ -1,9 +1,8 @@
-from app.extensions import db
-from flask_bcrypt import Bcrypt
+from app.extensions import db, bcrypt
+from app.common.hashing import password_hashing
+from flask import current_app
 import enum
 
-bcrypt = Bcrypt()
-
 class UserRole(enum.Enum):
     member = "member"
     librarian = "librarian"
@@ -20,6 +19,8 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
     role = db.Column(db.Enum(UserRole, native_enum=False), nullable=False, default=UserRole.member)
+    # Bumped whenever a role or password change must invalidate issued tokens
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     borrows = db.relationship('Borrow', backref='user', lazy=True)
 
@@ -30,17 +31,26 @@ class User(db.Model):
         self.role = role
 
     def set_password(self, password):
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        hashed = password_hashing.run(bcrypt.generate_password_hash, password)
+        self.password = hashed.decode('utf-8')
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hashing.run(bcrypt.check_password_hash, self.password, password)
+
+    def needs_rehash(self):
+        """True when the stored hash was made with a different bcrypt cost."""
+        try:
+            cost = int(self.password.split('$')[2])
+        except (AttributeError, IndexError, ValueError):
+            return True
+        return cost != current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
 
     def to_dict(self):
         return {
             'id': self.id,
             'name': self.name,
             'email': self.email,
-            'role': str(self.role)
+            'role': self.role
         }
 
     def __repr__(self):
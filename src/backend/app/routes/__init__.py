@@ -5,6 +5,8 @@ from .book import book_bp
 from .borrow import borrow_bp
 from .user import user_bp
 from .auth import auth_bp
+from .report import report_bp
+from .reservation import reservation_bp
 
 
 def register_blueprints(app):
@@ -14,4 +16,6 @@ def register_blueprints(app):
     app.register_blueprint(book_bp, url_prefix='/books')
     app.register_blueprint(borrow_bp, url_prefix='/borrows')
     app.register_blueprint(user_bp, url_prefix='/users')
-    app.register_blueprint(auth_bp, url_prefix='/auth')
\ No newline at end of file
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(report_bp, url_prefix='/reports')
+    app.register_blueprint(reservation_bp, url_prefix='/reservations')
\ No newline at end of file
@@ -2,17 +2,28 @@ from flask import Blueprint, request
 from ..common.api_response import jsend_success
 from ..services import author_service
 from ..common.auth import role_required
+from ..common.conditional import conditional_get
+from ..common.fields import requested_fields
 from werkzeug.exceptions import NotFound
 
 author_bp = Blueprint('authors', __name__)
 
 @author_bp.route('/', methods=['GET'])
+@conditional_get('authors', 'books')
 def get_authors():
-    authors = author_service.get_all_authors()
-    return jsend_success(authors)
+    result = author_service.get_all_authors(
+        prefix=request.args.get('prefix', type=str),
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('per_page', 20, type=int),
+        cursor=request.args.get('cursor', type=str),
+        include_total=request.args.get('include_total', 'true').lower() not in ('false', '0'),
+        fields=requested_fields(author_service.AUTHOR_FIELDS)
+    )
+    return jsend_success(result)
 
 
 @author_bp.route('/<int:author_id>', methods=['GET'])
+@conditional_get('authors', 'books')
 def get_author(author_id):
     author = author_service.get_author_by_id(author_id)
     if author is None:
@@ -1,24 +1,36 @@
-from flask import Blueprint, request
-from ..common.api_response import jsend_success
-from ..services import book_service
+from flask import Blueprint, request, current_app
+from ..common.api_response import jsend_success, jsend_fail
+from ..common.records import read_uploaded_records
+from ..services import book_service, google_books_service
 from ..common.auth import role_required
+from ..common.conditional import conditional_get
+from ..common.fields import requested_fields
 from werkzeug.exceptions import NotFound
 
 book_bp = Blueprint('books', __name__)
 
 @book_bp.route('/', methods=['GET'])
+@conditional_get('books', 'book_copies', 'authors', 'categories')
 def get_books():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     title = request.args.get('title', type=str)
     author = request.args.get('author', type=str)
     category = request.args.get('category', type=str)
+    q = request.args.get('q', type=str)
+    cursor = request.args.get('cursor', type=str)
+    include_total = request.args.get('include_total', 'true').lower() not in ('false', '0')
+    fields = requested_fields(book_service.BOOK_FIELDS)
 
-    result = book_service.get_all_books(page=page, per_page=per_page, title=title, author=author, category=category)
+    result = book_service.get_all_books(
+        page=page, per_page=per_page, title=title, author=author, category=category, q=q,
+        cursor=cursor, include_total=include_total, fields=fields
+    )
     return jsend_success(result)
 
 
 @book_bp.route('/<string:isbn>', methods=['GET'])
+@conditional_get('books', 'book_copies', 'authors', 'categories')
 def get_book(isbn):
     book = book_service.get_book_by_isbn(isbn)
     if book is None:
@@ -60,3 +72,29 @@ def import_book():
     data = request.get_json()
     new_book = book_service.import_book_from_google(data)
     return jsend_success(new_book, status_code=201)
+
+
+@book_bp.route('/bulk', methods=['POST'])
+@role_required('librarian', 'admin')
+def bulk_import_books():
+    records = read_uploaded_records()
+    report = book_service.bulk_import_books(
+        records, chunk_size=current_app.config['BULK_IMPORT_CHUNK_SIZE']
+    )
+    if report['total'] and not report['created']:
+        return jsend_fail(report, message='No books were imported')
+    return jsend_success(report, status_code=201 if report['created'] else 200)
+
+
+@book_bp.route('/import/isbns', methods=['POST'])
+@role_required('librarian', 'admin')
+def import_books_by_isbn():
+    data = request.get_json() or {}
+    isbns = data.get('isbns')
+    if not isinstance(isbns, list) or not isbns:
+        raise ValueError('isbns must be a non-empty list')
+
+    report = google_books_service.import_books_by_isbn(isbns, total_copies=data.get('total_copies', 1))
+    if not report['created']:
+        return jsend_fail(report, message='No books were imported')
+    return jsend_success(report, status_code=201)
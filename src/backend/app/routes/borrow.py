@@ -2,20 +2,30 @@ from flask import Blueprint, request, current_app
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from ..common.api_response import jsend_success
 from ..common.auth import role_required
+from ..common.dates import parse_datetime
+from ..common.export import requested_export_format, stream_rows
+from ..common.fields import requested_fields
 from ..services import borrow_service
 from werkzeug.exceptions import NotFound, Forbidden
 
 borrow_bp = Blueprint('borrows', __name__)
 
-@role_required('admin')
 @borrow_bp.route('/', methods=['GET'])
+@role_required('admin')
 def get_borrows():
+    export_format = requested_export_format()
+    if export_format:
+        since = parse_datetime(request.args.get('since', type=str), 'since')
+        until = parse_datetime(request.args.get('until', type=str), 'until')
+        rows = borrow_service.iter_borrow_export(since=since, until=until)
+        return stream_rows(rows, export_format, borrow_service.EXPORT_FIELDS, 'borrows')
+
     borrows = borrow_service.get_all_borrows()
     return jsend_success(borrows)
 
 
-@role_required('admin', 'librarian')
 @borrow_bp.route('/<int:borrow_id>', methods=['GET'])
+@role_required('admin', 'librarian')
 def get_borrow(borrow_id):
     borrow = borrow_service.get_borrow_by_id(borrow_id)
     if borrow is None:
@@ -31,7 +41,6 @@ def create_borrow():
     
     identity = get_jwt_identity()
     current_app.logger.warning("Current user identity: %s", identity)
-    print(identity)
     user_id = data.get('user_id') or identity
     book_isbn = data.get('book_isbn')
 
@@ -39,8 +48,8 @@ def create_borrow():
     return jsend_success(new_borrow, status_code=201)
 
 
-@role_required('librarian', 'admin')
 @borrow_bp.route('/<int:borrow_id>/return', methods=['POST'])
+@role_required('librarian', 'admin')
 def return_borrow(borrow_id):
     result = borrow_service.get_borrow_by_id(borrow_id)
     if result is None:
@@ -50,27 +59,46 @@ def return_borrow(borrow_id):
     return jsend_success(result)
 
 
-@role_required('member', 'librarian', 'admin')
 @borrow_bp.route('/user', methods=['GET'])
 @jwt_required()
+@role_required('member', 'librarian', 'admin')
 def get_user_borrows():
     identity = get_jwt_identity()
     borrows = borrow_service.get_borrows_by_user_id(identity)
     return jsend_success(borrows)
 
 
-@role_required('librarian', 'admin')
 @borrow_bp.route('/unreturned', methods=['GET'])
+@role_required('librarian', 'admin')
 def get_unreturned_borrows():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     search = request.args.get('search', type=str)
-    result = borrow_service.get_unreturned_borrows(page=page, per_page=per_page, search_member_name=search)
+    cursor = request.args.get('cursor', type=str)
+    include_total = request.args.get('include_total', 'true').lower() not in ('false', '0')
+    fields = requested_fields(borrow_service.BORROW_FIELDS)
+    result = borrow_service.get_unreturned_borrows(
+        page=page, per_page=per_page, search_member_name=search,
+        cursor=cursor, include_total=include_total, fields=fields
+    )
     return jsend_success(result)
 
 
+@borrow_bp.route('/overdue', methods=['GET'])
 @role_required('librarian', 'admin')
+def get_overdue_borrows():
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    cursor = request.args.get('cursor', type=str)
+    include_total = request.args.get('include_total', 'true').lower() not in ('false', '0')
+    result = borrow_service.get_overdue_borrows(
+        page=page, per_page=per_page, cursor=cursor, include_total=include_total
+    )
+    return jsend_success(result)
+
+
 @borrow_bp.route('/<int:borrow_id>', methods=['DELETE'])
+@role_required('librarian', 'admin')
 def delete_borrow(borrow_id):
     result = borrow_service.delete_borrow_by_id(borrow_id)
     if result is None:
@@ -2,16 +2,20 @@ from flask import Blueprint, request
 from ..common.api_response import jsend_success, jsend_fail
 from ..services import category_service
 from ..common.auth import role_required
+from ..common.conditional import conditional_get
+from ..common.fields import requested_fields
 from werkzeug.exceptions import NotFound
 
 category_bp = Blueprint('categories', __name__)
 
 @category_bp.route('/', methods=['GET'])
+@conditional_get('categories', 'books')
 def get_categories():
-    categories = category_service.get_all_categories()
+    categories = category_service.get_all_categories(fields=requested_fields(category_service.CATEGORY_FIELDS))
     return jsend_success(categories)
 
 @category_bp.route('/<int:category_id>', methods=['GET'])
+@conditional_get('categories', 'books')
 def get_category(category_id):
     category = category_service.get_category_by_id(category_id)
     if category is None:
@@ -1,8 +1,16 @@
 from flask import Blueprint
 from ..common.api_response import jsend_success
+from ..common.auth import role_required
+from ..common.cache import reference_cache
 
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route("/")
 def index():
     return jsend_success(data=None, message="Quill backend running", status_code=200)
+
+
+@main_bp.route("/cache/stats")
+@role_required('admin')
+def cache_stats():
+    return jsend_success(reference_cache.stats())
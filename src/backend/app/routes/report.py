@@ -0,0 +1,45 @@
+from flask import Blueprint, request
+from ..common.api_response import jsend_success
+from ..common.auth import role_required
+from ..common.dates import parse_datetime
+from ..services import report_service
+
+report_bp = Blueprint('reports', __name__)
+
+
+def _period_args():
+    since = parse_datetime(request.args.get('since', type=str), 'since')
+    until = parse_datetime(request.args.get('until', type=str), 'until')
+    return since, until
+
+
+def _limit_arg():
+    return max(1, min(request.args.get('limit', 10, type=int), 100))
+
+
+@report_bp.route('/popular-books', methods=['GET'])
+@role_required('librarian', 'admin')
+def popular_books():
+    since, until = _period_args()
+    return jsend_success(report_service.most_borrowed_books(since, until, limit=_limit_arg()))
+
+
+@report_bp.route('/categories', methods=['GET'])
+@role_required('librarian', 'admin')
+def category_statistics():
+    since, until = _period_args()
+    return jsend_success(report_service.category_statistics(since, until))
+
+
+@report_bp.route('/members', methods=['GET'])
+@role_required('librarian', 'admin')
+def member_activity():
+    since, until = _period_args()
+    return jsend_success(report_service.member_activity(since, until, limit=_limit_arg()))
+
+
+@report_bp.route('/daily', methods=['GET'])
+@role_required('librarian', 'admin')
+def daily_totals():
+    since, until = _period_args()
+    return jsend_success(report_service.daily_totals(since, until))
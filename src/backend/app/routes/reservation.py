@@ -0,0 +1,49 @@
+from flask import Blueprint, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from ..common.api_response import jsend_success
+from ..common.auth import get_current_user, role_required
+from ..services import reservation_service
+from werkzeug.exceptions import NotFound, Forbidden
+
+reservation_bp = Blueprint('reservations', __name__)
+
+
+def _owned_reservation(reservation_id):
+    """Load a reservation the caller may see: their own, or any for staff."""
+    reservation = reservation_service.get_reservation(reservation_id)
+    if reservation is None:
+        raise NotFound('Reservation not found')
+    # Tokens minted before the role claim existed take the role from the user row.
+    role = get_jwt().get('role') or str(get_current_user().role)
+    if role not in ('librarian', 'admin') and str(reservation.user_id) != str(get_jwt_identity()):
+        raise Forbidden('Insufficient permissions')
+    return reservation
+
+
+@reservation_bp.route('/', methods=['POST'])
+@role_required('member')
+def join_queue():
+    data = request.get_json() or {}
+    reservation = reservation_service.join_queue(get_jwt_identity(), data.get('book_isbn'))
+    return jsend_success(reservation, status_code=201)
+
+
+@reservation_bp.route('/user', methods=['GET'])
+@role_required('member', 'librarian', 'admin')
+def get_user_reservations():
+    reservations = reservation_service.get_user_reservations(get_jwt_identity())
+    return jsend_success(reservations)
+
+
+@reservation_bp.route('/<int:reservation_id>', methods=['GET'])
+@role_required('member', 'librarian', 'admin')
+def get_reservation(reservation_id):
+    reservation = _owned_reservation(reservation_id)
+    return jsend_success(reservation_service.reservation_details(reservation))
+
+
+@reservation_bp.route('/<int:reservation_id>', methods=['DELETE'])
+@role_required('member', 'librarian', 'admin')
+def leave_queue(reservation_id):
+    reservation = _owned_reservation(reservation_id)
+    return jsend_success(reservation_service.leave_queue(reservation))
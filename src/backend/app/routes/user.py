@@ -2,6 +2,7 @@ from flask import Blueprint, request
 from ..common.api_response import jsend_success
 from ..services import user_service
 from ..common.auth import role_required
+from ..common.fields import requested_fields
 from werkzeug.exceptions import NotFound
 
 user_bp = Blueprint('users', __name__)
@@ -9,7 +10,7 @@ user_bp = Blueprint('users', __name__)
 @role_required('librarian', 'admin')
 @user_bp.route('/', methods=['GET'])
 def get_users():
-    users = user_service.get_all_users()
+    users = user_service.get_all_users(fields=requested_fields(user_service.USER_FIELDS))
     return jsend_success(users)
 
 
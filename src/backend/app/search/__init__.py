@@ -0,0 +1,77 @@
+"""Ranked, typo-tolerant search over the book catalog.
+
+Postgres uses a tsvector expression index plus pg_trgm trigram indexes;
+SQLite (local runs and tests) uses an FTS5 trigram table kept in sync by
+triggers. Both backends expose the same ``word_similarity`` function so
+ranking behaves the same way everywhere.
+"""
+from sqlalchemy import event, func
+from ..extensions import db
+from ..models.author import Author
+from ..models.book import Book
+from . import postgres, sqlite
+
+_BACKENDS = {
+    'postgresql': postgres,
+    'sqlite': sqlite,
+}
+
+
+def _backend(dialect_name):
+    backend = _BACKENDS.get(dialect_name)
+    if backend is None:
+        raise ValueError(f"Search is not supported on '{dialect_name}' databases")
+    return backend
+
+
+def install_search_index(connection, rebuild=False):
+    """Create the search index objects if missing (idempotent)."""
+    backend = _BACKENDS.get(connection.dialect.name)
+    if backend is not None:
+        backend.install(connection, rebuild=rebuild)
+
+
+def uninstall_search_index(connection):
+    """Drop search objects that do not go away with the books table."""
+    backend = _BACKENDS.get(connection.dialect.name)
+    if backend is not None:
+        backend.uninstall(connection)
+
+
+def apply_search(query, q):
+    """Filter a Book query down to matches for ``q``, best matches first.
+
+    The query must already be joined to Author.
+    """
+    term = ' '.join(q.lower().split())
+    backend = _backend(db.session.get_bind().dialect.name)
+
+    title_similarity = func.word_similarity(term, func.lower(Book.title))
+    author_similarity = func.word_similarity(term, func.lower(Author.name))
+
+    query = query.filter(backend.match(term, title_similarity, author_similarity))
+    rank = backend.rank(term, title_similarity, author_similarity)
+    return query.order_by(rank.desc(), Book.isbn)
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Keep Alembic autogenerate from dropping the search tables and indexes."""
+    return not (reflected and name and name.startswith(sqlite.FTS_TABLE))
+
+
+def init_app(app):
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', sqlite.register_functions)
+
+
+@event.listens_for(Book.__table__, 'after_create')
+def _install_after_create(target, connection, **kw):
+    install_search_index(connection)
+
+
+@event.listens_for(Book.__table__, 'before_drop')
+def _uninstall_before_drop(target, connection, **kw):
+    uninstall_search_index(connection)
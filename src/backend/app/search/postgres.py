@@ -0,0 +1,47 @@
+from sqlalchemy import func, literal_column, or_, text
+from ..models.author import Author
+from ..models.book import Book
+
+# The query must repeat the indexed expression verbatim for the planner to
+# use ix_books_search_document.
+DOCUMENT = "to_tsvector('english', coalesce({t}title, '') || ' ' || coalesce({t}description, ''))"
+
+DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_books_search_document ON books USING gin ({DOCUMENT.format(t='')})",
+    "CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (lower(title) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_authors_name_trgm ON authors USING gin (lower(name) gin_trgm_ops)",
+]
+
+
+def install(connection, rebuild=False):
+    # Expression indexes are maintained by Postgres itself; nothing to rebuild.
+    for statement in DDL:
+        connection.execute(text(statement))
+
+
+def uninstall(connection):
+    # The indexes are dropped along with their tables; pg_trgm stays installed.
+    pass
+
+
+def _document():
+    return literal_column(DOCUMENT.format(t='books.'))
+
+
+def _tsquery(term):
+    return func.websearch_to_tsquery(literal_column("'english'"), term)
+
+
+def match(term, title_similarity, author_similarity):
+    # %> is "word similarity above pg_trgm.word_similarity_threshold" and is
+    # served by the gin_trgm_ops indexes.
+    return or_(
+        _document().op('@@')(_tsquery(term)),
+        func.lower(Book.title).op('%>')(term),
+        func.lower(Author.name).op('%>')(term),
+    )
+
+
+def rank(term, title_similarity, author_similarity):
+    return func.ts_rank(_document(), _tsquery(term)) + title_similarity + 0.5 * author_similarity
@@ -0,0 +1,177 @@
+import re
+from sqlalchemy import and_, literal_column, or_, select, text
+from ..models.author import Author
+from ..models.book import Book
+
+FTS_TABLE = 'books_fts'
+# books has a string primary key, so its implicit rowid is not stable (VACUUM
+# may renumber it). FTS rows are keyed on this table's INTEGER PRIMARY KEY.
+KEYS_TABLE = f'{FTS_TABLE}_keys'
+FTS_COLUMNS = ['title', 'author', 'description']
+
+# Same default as pg_trgm.word_similarity_threshold.
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_KEY = f"(SELECT id FROM {KEYS_TABLE} WHERE isbn = {{row}}.isbn)"
+_AUTHOR = "(SELECT name FROM authors WHERE id = new.author_id)"
+
+DDL = [
+    f"CREATE TABLE IF NOT EXISTS {KEYS_TABLE} (id INTEGER PRIMARY KEY, isbn TEXT NOT NULL UNIQUE)",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({', '.join(FTS_COLUMNS)}, tokenize = 'trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_books_ai AFTER INSERT ON books BEGIN
+        INSERT OR IGNORE INTO {KEYS_TABLE}(isbn) VALUES (new.isbn);
+        DELETE FROM {FTS_TABLE} WHERE rowid = {_KEY.format(row='new')};
+        INSERT INTO {FTS_TABLE}(rowid, title, author, description)
+        VALUES ({_KEY.format(row='new')}, new.title, {_AUTHOR}, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_books_au
+        AFTER UPDATE OF isbn, title, author_id, description ON books BEGIN
+        UPDATE {KEYS_TABLE} SET isbn = new.isbn WHERE isbn = old.isbn;
+        UPDATE {FTS_TABLE}
+        SET title = new.title, author = {_AUTHOR}, description = new.description
+        WHERE rowid = {_KEY.format(row='new')};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_books_ad AFTER DELETE ON books BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = {_KEY.format(row='old')};
+        DELETE FROM {KEYS_TABLE} WHERE isbn = old.isbn;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_authors_au AFTER UPDATE OF name ON authors BEGIN
+        UPDATE {FTS_TABLE} SET author = new.name
+        WHERE rowid IN (
+            SELECT keys.id FROM {KEYS_TABLE} AS keys JOIN books ON books.isbn = keys.isbn
+            WHERE books.author_id = new.id
+        );
+    END""",
+]
+
+DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_books_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_books_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_books_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_authors_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    f"DROP TABLE IF EXISTS {KEYS_TABLE}",
+]
+
+REBUILD = [
+    f"DELETE FROM {FTS_TABLE}",
+    f"DELETE FROM {KEYS_TABLE}",
+    f"INSERT INTO {KEYS_TABLE}(isbn) SELECT isbn FROM books",
+    f"""INSERT INTO {FTS_TABLE}(rowid, title, author, description)
+        SELECT keys.id, books.title, authors.name, books.description
+        FROM books
+        JOIN {KEYS_TABLE} AS keys ON keys.isbn = books.isbn
+        LEFT JOIN authors ON authors.id = books.author_id""",
+]
+
+_WORD = re.compile(r'\w+')
+
+
+def _padded_trigrams(value):
+    """Trigrams the way pg_trgm builds them: per word, padded with blanks."""
+    grams = set()
+    for word in _WORD.findall(value.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(needle, haystack):
+    """Share of the needle's trigrams found in the haystack (0..1)."""
+    if not needle or not haystack:
+        return 0.0
+    wanted = _padded_trigrams(needle)
+    if not wanted:
+        return 0.0
+    return len(wanted & _padded_trigrams(haystack)) / len(wanted)
+
+
+def register_functions(dbapi_connection, connection_record):
+    dbapi_connection.create_function('word_similarity', 2, word_similarity, deterministic=True)
+
+
+def _is_current(connection):
+    """False when an index from an older layout (or none at all) is present."""
+    columns = [row[1] for row in connection.execute(text(f"PRAGMA table_info({FTS_TABLE})"))]
+    keys = connection.execute(text(f"PRAGMA table_info({KEYS_TABLE})")).fetchall()
+    return columns == FTS_COLUMNS and bool(keys)
+
+
+def install(connection, rebuild=False):
+    if not _is_current(connection):
+        # Drop whatever an older layout left behind and index existing rows.
+        uninstall(connection)
+        rebuild = True
+    for statement in DDL:
+        connection.execute(text(statement))
+    if rebuild:
+        for statement in REBUILD:
+            connection.execute(text(statement))
+
+
+def uninstall(connection):
+    # Triggers go first: they reference the FTS and keys tables.
+    for statement in DROP:
+        connection.execute(text(statement))
+
+
+def _trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def _match_expression(term):
+    # The FTS5 trigram tokenizer matches raw substrings, so any shared trigram
+    # makes a row a candidate; word_similarity then applies the typo threshold.
+    grams = set()
+    for word in _WORD.findall(term):
+        grams.update(_trigrams(word))
+    if not grams:
+        return None
+    return '{title author} : (' + ' OR '.join(f'"{gram}"' for gram in sorted(grams)) + ')'
+
+
+def _description_expression(term):
+    # Every word must appear in the description, like the AND query the
+    # Postgres backend runs against its title + description document. Words
+    # shorter than a trigram cannot be matched by the index and are skipped.
+    words = sorted({word for word in _WORD.findall(term) if _trigrams(word)})
+    if not words:
+        return None
+    return 'description : (' + ' AND '.join(f'"{word}"' for word in words) + ')'
+
+
+def _indexed(expression):
+    """Books whose FTS row matches ``expression``."""
+    rowids = (
+        select(literal_column('rowid'))
+        .select_from(text(FTS_TABLE))
+        .where(literal_column(FTS_TABLE).op('MATCH')(expression))
+    )
+    isbns = (
+        select(literal_column('isbn'))
+        .select_from(text(KEYS_TABLE))
+        .where(literal_column('id').in_(rowids))
+    )
+    return Book.isbn.in_(isbns)
+
+
+def match(term, title_similarity, author_similarity):
+    expression = _match_expression(term)
+    if not expression:
+        # Too short for trigrams; fall back to a plain substring match.
+        return or_(Book.title.ilike(f'%{term}%'), Author.name.ilike(f'%{term}%'))
+
+    return or_(
+        and_(
+            _indexed(expression),
+            or_(
+                title_similarity >= WORD_SIMILARITY_THRESHOLD,
+                author_similarity >= WORD_SIMILARITY_THRESHOLD,
+            ),
+        ),
+        _indexed(_description_expression(term)),
+    )
+
+
+def rank(term, title_similarity, author_similarity):
+    return title_similarity + 0.5 * author_similarity
@@ -1,4 +1,5 @@
 from ..models.user import User
+from ..extensions import db
 from flask_jwt_extended import create_access_token
 from werkzeug.exceptions import Unauthorized  
 
@@ -12,6 +13,17 @@ def login_user(email, password):
     if not user_model or not user_model.check_password(password):
         raise Unauthorized('Invalid credentials')
 
-    access_token = create_access_token(identity=str(user_model.id))
+    # Upgrade hashes made with an older work factor while we have the password
+    if user_model.needs_rehash():
+        user_model.set_password(password)
+        db.session.commit()
+
+    access_token = create_access_token(
+        identity=str(user_model.id),
+        additional_claims={
+            'role': str(user_model.role),
+            'token_version': user_model.token_version or 0
+        }
+    )
 
     return access_token, user_model.to_dict()
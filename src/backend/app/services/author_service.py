@@ -1,15 +1,105 @@
 from ..models.author import Author
+from ..models.book import Book
 from ..extensions import db
+from ..common.cache import reference_cache
+from ..common.conditional import validated_versions
+from ..common.fields import select_fields, with_sort_keys
+from ..common.pagination import keyset_paginate
+from ..common.replica import read_only
+from sqlalchemy import func
 
-def get_all_authors():
-    authors = Author.query.all()
-    return [author.to_dict() for author in authors]
+# Fields of an author in list responses, in output order.
+AUTHOR_FIELDS = ('id', 'name', 'books_count')
+AUTHOR_COLUMNS = {'id': Author.id, 'name': Author.name}
+
+def _count_books(author_ids):
+    """Books per author for ``author_ids``, from one grouped count over the books.author_id index."""
+    if not author_ids:
+        return {}
+    rows = (
+        db.session.query(Book.author_id, func.count(Book.isbn))
+        .filter(Book.author_id.in_(author_ids))
+        .group_by(Book.author_id)
+        .all()
+    )
+    return dict(rows)
+
+def _author_page(items, fields):
+    # Pages are counted on their own, so the cost follows the page size, not the catalog.
+    fields = fields or AUTHOR_FIELDS
+    counts = _count_books([row.id for row in items]) if 'books_count' in fields else {}
+    return [
+        {name: counts.get(row.id, 0) if name == 'books_count' else row._mapping[name] for name in fields}
+        for row in items
+    ]
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _load_author_page(prefix, page, per_page, cursor, include_total, fields):
+    sort_columns = (Author.name, Author.id)
+    selected = fields
+    if fields is not None:
+        # The id is always read: it is the cursor tie-breaker and the key of the counts.
+        selected = with_sort_keys(tuple(name for name in fields if name in AUTHOR_COLUMNS), ('name', 'id'))
+    query = db.session.query(*select_fields(AUTHOR_COLUMNS, selected)).select_from(Author)
+    if prefix:
+        query = query.filter(func.lower(Author.name).like(_escape_like(prefix.lower()) + '%', escape='\\'))
+    query = query.order_by(*sort_columns)
+
+    if cursor is not None:
+        items, next_cursor, total_count = keyset_paginate(
+            query, sort_columns, cursor=cursor, per_page=per_page, include_total=include_total
+        )
+        return {
+            'authors': _author_page(items, fields),
+            'pagination': {
+                'per_page': per_page,
+                'total_items': total_count,
+                'has_next': next_cursor is not None,
+                'next_cursor': next_cursor
+            }
+        }
+
+    authors = query.paginate(page=page, per_page=per_page, error_out=False, count=include_total)
+    return {
+        'authors': _author_page(authors.items, fields),
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total_pages': authors.pages if include_total else None,
+            'total_items': authors.total,
+            'has_next': authors.has_next if include_total else len(authors.items) == per_page,
+            'has_prev': authors.has_prev
+        }
+    }
+
+@read_only
+def get_all_authors(prefix=None, page=1, per_page=20, cursor=None, include_total=True, fields=None):
+    """One page of authors ordered by name, optionally limited to names starting with ``prefix``.
+
+    The prefix match is case-insensitive. ``cursor`` switches from page
+    numbers to keyset pagination on (name, id). There is no unpaginated
+    form: the authors table is too large to send, count or cache whole.
+    """
+    if per_page < 1 or per_page > 100:
+        raise ValueError('per_page must be between 1 and 100')
+    key = (prefix, page, per_page, cursor, include_total, fields)
+    return reference_cache.get_or_load(
+        'authors', key, lambda: _load_author_page(*key), version=validated_versions()
+    )
+
+def _invalidate_authors(books_changed=False):
+    reference_cache.invalidate('authors')
+    if books_changed:
+        # Cached books embed the author name.
+        reference_cache.invalidate('books')
 
 def get_author_by_id(author_id):
     author = Author.query.get(author_id)
     if not author:
         return None
-    return author.to_dict()
+    return author.to_dict(_count_books([author.id]).get(author.id, 0))
 
 def create_new_author(data):
     if not data or not data.get('name'):
@@ -22,7 +112,8 @@ def create_new_author(data):
     author = Author(name=data['name'])
     db.session.add(author)
     db.session.commit()
-    return author.to_dict()
+    _invalidate_authors()
+    return author.to_dict(0)
 
 def update_existing_author(author_id, data):
     author = Author.query.get(author_id)
@@ -38,7 +129,8 @@ def update_existing_author(author_id, data):
 
     author.name = data['name']
     db.session.commit()
-    return author.to_dict()
+    _invalidate_authors(books_changed=True)
+    return author.to_dict(_count_books([author.id]).get(author.id, 0))
 
 def delete_author_by_id(author_id):
     author = Author.query.get(author_id)
@@ -47,4 +139,5 @@ def delete_author_by_id(author_id):
 
     db.session.delete(author)
     db.session.commit()
+    _invalidate_authors(books_changed=True)
     return True
@@ -1,32 +1,99 @@
-from ..services.category_service import create_new_category
-from ..services.author_service import create_new_author
 from ..models.author import Author
 from ..models.category import Category
 from ..models.book import Book
 from ..extensions import db
+from ..common.pagination import keyset_paginate
+from ..common.fields import select_fields, trim_rows, with_sort_keys
+from ..search import apply_search
+from ..common.cache import reference_cache
+from ..common.conditional import validated_versions
+from ..common.replica import read_only
+from sqlalchemy import update, insert, func
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import joinedload
 
-def get_all_books(page=1, per_page=10, title=None, author=None, category=None):
-    from ..models.author import Author
-    from ..models.category import Category
+def _book_query():
+    """Book query that loads author and category names in the same SELECT,
+    so serializing a page costs one query whatever its size."""
+    return Book.query.options(joinedload(Book.author), joinedload(Book.category))
 
-    query = Book.query
+# Fields of a book in list responses, in output order.
+BOOK_COLUMNS = {
+    'isbn': Book.isbn,
+    'title': Book.title,
+    'cover': Book.cover,
+    'total_copies': Book.total_copies,
+    'available_copies': Book.available_copies,
+    'description': Book.description,
+    'author_id': Book.author_id,
+    'category_id': Book.category_id,
+    'author': Author.name,
+    'category': Category.name,
+}
+BOOK_FIELDS = tuple(BOOK_COLUMNS)
 
+def _book_rows(fields=None, join_author=False):
+    """The fields of Book.to_dict as plain result rows, for list endpoints.
+
+    The JSON provider serializes the rows as they are, so a page builds no
+    ORM objects or intermediate dicts. With ``fields`` only those columns are
+    selected, and the author and category joins are made only when needed.
+    """
+    query = db.session.query(*select_fields(BOOK_COLUMNS, fields)).select_from(Book)
+    if fields is None or 'author' in fields or join_author:
+        query = query.outerjoin(Author, Author.id == Book.author_id)
+    if fields is None or 'category' in fields:
+        query = query.outerjoin(Category, Category.id == Book.category_id)
+    return query
+
+@read_only
+def get_all_books(page=1, per_page=10, title=None, author=None, category=None, q=None, cursor=None,
+                  include_total=True, fields=None):
+    if q and cursor is not None:
+        raise ValueError('cursor pagination cannot be combined with q')
+    selected = with_sort_keys(fields, ('title', 'isbn')) if cursor is not None else fields
+    query = _book_rows(selected, join_author=bool(q))
+
+    # title/author/category are exact-match facets; free text goes through q.
     if title:
-        query = query.filter(Book.title.ilike(f'%{title}%'))
+        query = query.filter(Book.title == title)
     if author:
-        query = query.join(Author, Book.author_id == Author.id).filter(Author.name.ilike(f'%{author}%'))
+        query = query.filter(Book.author_id.in_(db.session.query(Author.id).filter(Author.name == author)))
     if category:
-        query = query.join(Category, Book.category_id == Category.id).filter(Category.name.ilike(f'%{category}%'))
+        query = query.filter(Book.category_id.in_(db.session.query(Category.id).filter(Category.name == category)))
+
+    sort_columns = (Book.title, Book.isbn)
+
+    if q:
+        query = apply_search(query, q)
+    else:
+        query = query.order_by(*sort_columns)
+
+    if cursor is not None:
+        items, next_cursor, total_count = keyset_paginate(
+            query, sort_columns, cursor=cursor, per_page=per_page, include_total=include_total
+        )
+        return {
+            'books': trim_rows(items, fields),
+            'pagination': {
+                'per_page': per_page,
+                'total_items': total_count,
+                'has_next': next_cursor is not None,
+                'next_cursor': next_cursor
+            }
+        }
 
-    books = query.paginate(page=page, per_page=per_page, error_out=False)
+    books = query.paginate(
+        page=page, per_page=per_page, error_out=False, count=include_total
+    )
 
     total_count = books.total
-    total_pages = books.pages
-    has_next = books.has_next
+    total_pages = books.pages if include_total else None
+    has_next = books.has_next if include_total else len(books.items) == per_page
     has_prev = books.has_prev
 
     result = {
-        'books': [book.to_dict() for book in books.items],
+        'books': books.items,
         'pagination': {
             'page': page,
             'per_page': per_page,
@@ -38,12 +105,25 @@ def get_all_books(page=1, per_page=10, title=None, author=None, category=None):
     }
     return result
 
-def get_book_by_isbn(isbn):
-    book = Book.query.get(isbn)
+def _load_book(isbn):
+    book = _book_query().filter(Book.isbn == isbn).first()
     if not book:
         return None
     return book.to_dict()
 
+@read_only
+def get_book_by_isbn(isbn):
+    return reference_cache.get_or_load('books', isbn, lambda: _load_book(isbn), version=validated_versions())
+
+def invalidate_book(isbn):
+    reference_cache.invalidate('books', isbn)
+
+def _invalidate_catalog(isbn):
+    invalidate_book(isbn)
+    # books_count on the author and category lists changes with the catalog.
+    reference_cache.invalidate('authors')
+    reference_cache.invalidate('categories')
+
 def create_new_book(data):
     required = ['isbn', 'title', 'author_id', 'category_id']
     if not data or not all(k in data for k in required):
@@ -65,6 +145,7 @@ def create_new_book(data):
 
     db.session.add(book)
     db.session.commit()
+    _invalidate_catalog(book.isbn)
     return book.to_dict()
 
 def update_existing_book(isbn, data):
@@ -93,12 +174,25 @@ def update_existing_book(isbn, data):
         except (ValueError, TypeError) as e:
             raise ValueError("Total copies must be a valid integer >= 1")
 
-    for field in ('title', 'cover', 'total_copies', 'description', 'author_id', 'category_id'):
+    for field in ('title', 'cover', 'description', 'author_id', 'category_id'):
         if field in data:
             setattr(book, field, data[field])
 
     try:
+        if 'total_copies' in data:
+            # Shift available_copies by the same delta in one statement, refusing
+            # to drop below the number of copies currently on loan.
+            delta = data['total_copies'] - Book.total_copies
+            resized = db.session.execute(
+                update(Book)
+                .where(Book.isbn == isbn, Book.available_copies + delta >= 0)
+                .values(total_copies=data['total_copies'], available_copies=Book.available_copies + delta)
+                .execution_options(synchronize_session='fetch')
+            )
+            if resized.rowcount == 0:
+                raise ValueError("Total copies cannot be less than the number of borrowed copies")
         db.session.commit()
+        _invalidate_catalog(isbn)
         return book.to_dict()
     except Exception as e:
         db.session.rollback()
@@ -111,6 +205,32 @@ def delete_book_by_isbn(isbn):
 
     db.session.delete(book)
     db.session.commit()
+    _invalidate_catalog(isbn)
+
+DEFAULT_AUTHOR = 'Unknown Author'
+DEFAULT_CATEGORY = 'Uncategorized'
+
+def _resolve_names(model, names):
+    """Map names to ids for Author or Category, creating the missing ones.
+
+    One SELECT for the whole batch plus one multi-row INSERT for the names
+    that do not exist yet. Runs inside the caller's transaction.
+    """
+    names = {name for name in names if name}
+    if not names:
+        return {}
+
+    def lookup(wanted):
+        rows = db.session.query(model.name, func.min(model.id)) \
+            .filter(model.name.in_(wanted)).group_by(model.name).all()
+        return dict(rows)
+
+    resolved = lookup(names)
+    missing = names - resolved.keys()
+    if missing:
+        db.session.execute(insert(model), [{'name': name} for name in sorted(missing)])
+        resolved.update(lookup(missing))
+    return resolved
 
 def import_book_from_google(data):
     required = ['isbn', 'title']
@@ -121,29 +241,11 @@ def import_book_from_google(data):
     if existing:
         raise ValueError(f"Book with ISBN '{data['isbn']}' already exists")
 
-    author_id = None
-    if 'author_name' in data and data['author_name']:
-        author = Author.query.filter_by(name=data['author_name']).first()
-        if not author:
-            author = create_new_author({'name': data['author_name']})
-        author_id = author['id'] if isinstance(author, dict) else author.id
-    else:
-        default_author = Author.query.filter_by(name='Unknown Author').first()
-        if not default_author:
-            default_author = create_new_author({'name': 'Unknown Author'})
-        author_id = default_author['id'] if isinstance(default_author, dict) else default_author.id
-
-    category_id = None
-    if 'category_name' in data and data['category_name']:
-        category = Category.query.filter_by(name=data['category_name']).first()
-        if not category:
-            category = create_new_category({'name': data['category_name']})
-        category_id = category['id'] if isinstance(category, dict) else category.id
-    else:
-        default_category = Category.query.filter_by(name='Uncategorized').first()
-        if not default_category:
-            default_category = create_new_category({'name': 'Uncategorized'})
-        category_id = default_category['id'] if isinstance(default_category, dict) else default_category.id
+    # Author, category and book are created in one transaction
+    author_name = data.get('author_name') or DEFAULT_AUTHOR
+    category_name = data.get('category_name') or DEFAULT_CATEGORY
+    author_id = _resolve_names(Author, [author_name])[author_name]
+    category_id = _resolve_names(Category, [category_name])[category_name]
 
     book = Book(
         isbn=data['isbn'],
@@ -155,7 +257,209 @@ def import_book_from_google(data):
         description=data.get('description')
     )
 
-    db.session.add(book)
-    db.session.commit()
+    try:
+        db.session.add(book)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    _invalidate_catalog(book.isbn)
     return book.to_dict()
-    return True
+
+def _check_length(field, value, column):
+    # Over-long values would fail the whole INSERT on Postgres, so they are caught per row.
+    if value is not None and len(value) > column.type.length:
+        raise ValueError(f'{field} must be at most {column.type.length} characters')
+
+def _validate_bulk_record(record):
+    """Normalize one bulk-import record into insert values, or raise ValueError."""
+    if isinstance(record, Exception):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError('Each record must be an object')
+
+    isbn = str(record.get('isbn') or '').strip()
+    title = str(record.get('title') or '').strip()
+    if not isbn or not title:
+        raise ValueError('isbn and title are required')
+    _check_length('isbn', isbn, Book.isbn)
+    _check_length('title', title, Book.title)
+    cover = str(record['cover']) if record.get('cover') else None
+    _check_length('cover', cover, Book.cover)
+    author_name = str(record.get('author_name') or record.get('author') or DEFAULT_AUTHOR).strip()
+    _check_length('author_name', author_name, Author.name)
+    category_name = str(record.get('category_name') or record.get('category') or DEFAULT_CATEGORY).strip()
+    _check_length('category_name', category_name, Category.name)
+
+    # Only a missing or blank value means one copy; an explicit 0 is an error.
+    copies = record.get('total_copies')
+    if copies is None or (isinstance(copies, str) and not copies.strip()):
+        copies = 1
+    try:
+        if isinstance(copies, bool) or (isinstance(copies, float) and not copies.is_integer()):
+            raise ValueError
+        copies = int(copies)
+    except (TypeError, ValueError):
+        raise ValueError('Total copies must be a valid integer >= 1')
+    if copies < 1:
+        raise ValueError('Total copies must be a valid integer >= 1')
+
+    return {
+        'isbn': isbn,
+        'title': title,
+        'cover': cover,
+        'description': record.get('description') or None,
+        'total_copies': copies,
+        'available_copies': copies,
+        'author_name': author_name,
+        'category_name': category_name,
+    }
+
+def _insert_books(rows, errors):
+    """Insert a chunk with executemany; on failure, retry row by row so only
+    the offending rows are reported. Constraint and data errors (such as a
+    value the column cannot hold) both fall back to the per-row pass."""
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(Book), [values for _, values in rows])
+        return len(rows)
+    except DBAPIError:
+        pass
+
+    created = 0
+    for row_number, values in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Book), [values])
+            created += 1
+        except DBAPIError as e:
+            errors.append({'row': row_number, 'isbn': values['isbn'], 'error': str(e.orig)})
+    return created
+
+def _import_chunk(chunk, seen_isbns, errors):
+    valid = []
+    for row_number, record in chunk:
+        try:
+            values = _validate_bulk_record(record)
+        except ValueError as e:
+            isbn = record.get('isbn') if isinstance(record, dict) else None
+            errors.append({'row': row_number, 'isbn': isbn, 'error': str(e)})
+            continue
+        if values['isbn'] in seen_isbns:
+            errors.append({'row': row_number, 'isbn': values['isbn'], 'error': 'Duplicate ISBN in upload'})
+            continue
+        seen_isbns.add(values['isbn'])
+        valid.append((row_number, values))
+    if not valid:
+        return 0
+
+    existing = {
+        isbn for (isbn,) in db.session.query(Book.isbn)
+        .filter(Book.isbn.in_([values['isbn'] for _, values in valid]))
+    }
+    authors = _resolve_names(Author, [values['author_name'] for _, values in valid])
+    categories = _resolve_names(Category, [values['category_name'] for _, values in valid])
+
+    rows = []
+    for row_number, values in valid:
+        if values['isbn'] in existing:
+            errors.append({'row': row_number, 'isbn': values['isbn'], 'error': f"Book with ISBN '{values['isbn']}' already exists"})
+            continue
+        values['author_id'] = authors[values.pop('author_name')]
+        values['category_id'] = categories[values.pop('category_name')]
+        rows.append((row_number, values))
+    return _insert_books(rows, errors) if rows else 0
+
+def bulk_import_books(records, chunk_size=1000):
+    """Import many books in one transaction, chunk_size rows per INSERT.
+
+    ``records`` is any iterable of dicts (an Exception instance marks a row
+    that could not be parsed). Bad rows are reported and skipped; the rest
+    of the load goes through.
+    """
+    errors = []
+    seen_isbns = set()
+    created = 0
+    total = 0
+    chunk = []
+
+    try:
+        for total, record in enumerate(records, start=1):
+            chunk.append((total, record))
+            if len(chunk) >= chunk_size:
+                created += _import_chunk(chunk, seen_isbns, errors)
+                chunk = []
+        if chunk:
+            created += _import_chunk(chunk, seen_isbns, errors)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if created:
+        reference_cache.invalidate('authors')
+        reference_cache.invalidate('categories')
+    return {
+        'total': total,
+        'created': created,
+        'failed': len(errors),
+        'errors': sorted(errors, key=lambda error: error['row'])
+    }
+
+def reconcile_available_copies(fix=True):
+    """Recompute available_copies from the borrows and reservations tables.
+
+    Copies that are lent out or held for a ready reservation are off the
+    shelf. Returns a list of the books whose stored counter had drifted.
+    """
+    from ..models.borrow import Borrow
+    from ..models.reservation import Reservation
+
+    active = (
+        db.session.query(Borrow.book_isbn, func.count(Borrow.id).label('active'))
+        .filter(Borrow.return_date.is_(None))
+        .group_by(Borrow.book_isbn)
+        .subquery()
+    )
+    held = (
+        db.session.query(Reservation.book_isbn, func.count(Reservation.id).label('held'))
+        .filter(Reservation.status == Reservation.READY)
+        .group_by(Reservation.book_isbn)
+        .subquery()
+    )
+    expected = Book.total_copies - func.coalesce(active.c.active, 0) - func.coalesce(held.c.held, 0)
+    rows = (
+        db.session.query(Book.isbn, Book.available_copies, expected)
+        .outerjoin(active, active.c.book_isbn == Book.isbn)
+        .outerjoin(held, held.c.book_isbn == Book.isbn)
+        .filter(Book.available_copies != expected)
+        .all()
+    )
+
+    drift = [
+        {'isbn': isbn, 'stored': stored, 'expected': correct}
+        for isbn, stored, correct in rows
+    ]
+    if fix and drift:
+        # Recount inside the UPDATE itself so borrows made since the scan are
+        # not lost.
+        active_count = (
+            db.session.query(func.count(Borrow.id))
+            .filter(Borrow.book_isbn == Book.isbn, Borrow.return_date.is_(None))
+            .scalar_subquery()
+        )
+        held_count = (
+            db.session.query(func.count(Reservation.id))
+            .filter(Reservation.book_isbn == Book.isbn, Reservation.status == Reservation.READY)
+            .scalar_subquery()
+        )
+        db.session.execute(
+            update(Book)
+            .where(Book.isbn.in_([row['isbn'] for row in drift]))
+            .values(available_copies=Book.total_copies - active_count - held_count)
+            .execution_options(synchronize_session=False, table_version='book_copies')
+        )
+        db.session.commit()
+        for row in drift:
+            invalidate_book(row['isbn'])
+    return drift
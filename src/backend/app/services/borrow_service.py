@@ -5,14 +5,100 @@ from ..models.borrow import Borrow
 from ..models.book import Book
 from ..models.user import User
 from ..extensions import db
-from datetime import datetime
+from ..common.pagination import keyset_paginate
+from ..common.fields import select_fields, trim_rows, with_sort_keys
+from .book_service import invalidate_book
+from . import report_service, reservation_service
+from ..common.dates import as_utc
+from datetime import datetime, timezone
+from sqlalchemy import Boolean, Integer, and_, case, cast, func, literal, type_coerce, update
+from sqlalchemy.orm import joinedload
+
+def _borrow_query():
+    """Borrow query that loads the book title and member name in the same
+    SELECT instead of two lazy loads per row."""
+    return Borrow.query.options(joinedload(Borrow.book), joinedload(Borrow.user))
+
+# Fields of a borrow in list responses, in output order.
+BORROW_FIELDS = (
+    'id', 'borrow_date', 'due_date', 'return_date', 'is_overdue', 'days_overdue',
+    'user_id', 'book_isbn', 'book_title', 'member_name'
+)
+
+def _borrow_rows(now, fields=None, join_user=False):
+    """The fields of Borrow.to_dict as plain result rows, overdue flags included.
+
+    List endpoints hand these rows straight to the JSON provider, skipping
+    ORM objects and per-row dicts. The overdue day count is computed by the
+    database against ``now``. With ``fields`` only those columns are
+    selected, and the book and member joins are made only when needed.
+    """
+    overdue = and_(Borrow.return_date.is_(None), Borrow.due_date < now)
+    columns = {
+        'id': Borrow.id,
+        'borrow_date': Borrow.borrow_date,
+        'due_date': Borrow.due_date,
+        'return_date': Borrow.return_date,
+        'is_overdue': type_coerce(overdue, Boolean),
+        'days_overdue': case((overdue, _days_since(now, Borrow.due_date)), else_=0),
+        'user_id': Borrow.user_id,
+        'book_isbn': Borrow.book_isbn,
+        'book_title': Book.title,
+        'member_name': User.name,
+    }
+    query = db.session.query(*select_fields(columns, fields)).select_from(Borrow)
+    if fields is None or 'book_title' in fields:
+        query = query.outerjoin(Book, Book.isbn == Borrow.book_isbn)
+    if fields is None or 'member_name' in fields or join_user:
+        query = query.outerjoin(User, User.id == Borrow.user_id)
+    return query
 
 def get_all_borrows():
-    borrows = Borrow.query.all()
-    return [borrow.to_dict() for borrow in borrows]
+    now = datetime.now(timezone.utc)
+    return _borrow_rows(now).all()
+
+EXPORT_FIELDS = BORROW_FIELDS
+
+def iter_borrow_export(since=None, until=None, batch_size=1000):
+    """Yield every borrow as a flat dict, reading through a server-side cursor.
+
+    Rows are fetched batch_size at a time and never held in memory together,
+    so the export stays flat whatever the size of the table. since/until
+    bound borrow_date (since inclusive, until exclusive).
+    """
+    query = (
+        db.session.query(
+            Borrow.id, Borrow.borrow_date, Borrow.due_date, Borrow.return_date,
+            Borrow.user_id, Borrow.book_isbn, Book.title, User.name
+        )
+        .outerjoin(Book, Book.isbn == Borrow.book_isbn)
+        .outerjoin(User, User.id == Borrow.user_id)
+    )
+    if since is not None:
+        query = query.filter(Borrow.borrow_date >= since)
+    if until is not None:
+        query = query.filter(Borrow.borrow_date < until)
+    query = query.order_by(Borrow.borrow_date, Borrow.id).yield_per(batch_size)
+
+    now = datetime.now(timezone.utc)
+    for borrow_id, borrow_date, due_date, return_date, user_id, book_isbn, title, member in query:
+        due_date = as_utc(due_date)
+        overdue = return_date is None and now > due_date
+        yield {
+            'id': borrow_id,
+            'borrow_date': as_utc(borrow_date),
+            'due_date': due_date,
+            'return_date': as_utc(return_date),
+            'is_overdue': overdue,
+            'days_overdue': (now - due_date).days if overdue else 0,
+            'user_id': user_id,
+            'book_isbn': book_isbn,
+            'book_title': title,
+            'member_name': member
+        }
 
 def get_borrow_by_id(borrow_id):
-    borrow = Borrow.query.get(borrow_id)
+    borrow = _borrow_query().filter(Borrow.id == borrow_id).first()
     if not borrow:
         return None
     return borrow.to_dict()
@@ -25,20 +111,33 @@ def create_new_borrow(user_id, book_isbn):
         logger.error(f"User not found: user_id={user_id}")
         raise ValueError('User not found')
 
-    book = Book.query.get(book_isbn)
-    if not book:
-        logger.error(f"Book not found: book_isbn={book_isbn}")
-        raise ValueError('Book not found')
-
-    logger.info(f"Book availability: available_copies={book.available_copies}, is_available={book.is_available}")
-    if not book.is_available:
+    # A copy held for this member's reservation is already off the shelf.
+    # Otherwise take one with a single conditional UPDATE so two concurrent
+    # checkouts can never both get the last one.
+    if reservation_service.take_held_copy(user.id, book_isbn):
+        taken = db.session.query(Book.category_id).filter(Book.isbn == book_isbn).first()
+    else:
+        taken = db.session.execute(
+            update(Book)
+            .where(Book.isbn == book_isbn, Book.available_copies > 0)
+            .values(available_copies=Book.available_copies - 1)
+            .returning(Book.category_id)
+            .execution_options(table_version='book_copies')
+        ).first()
+    if taken is None:
+        db.session.rollback()
+        if not Book.query.get(book_isbn):
+            logger.error(f"Book not found: book_isbn={book_isbn}")
+            raise ValueError('Book not found')
         logger.warning(f"No copies available for book: book_isbn={book_isbn}")
         raise ValueError('No copies available')
 
     try:
         borrow = Borrow(user_id=user_id, book_isbn=book_isbn)
         db.session.add(borrow)
+        report_service.record_borrow(book_isbn, taken.category_id, user.id, borrow.borrow_date)
         db.session.commit()
+        invalidate_book(book_isbn)
         logger.info(f"Borrow created successfully: borrow_id={borrow.id}")
         return borrow.to_dict()
     except Exception as e:
@@ -54,34 +153,112 @@ def return_borrow(borrow_id):
     if borrow.return_date is not None:
         raise ValueError('Borrow already returned')
 
-    borrow.return_book()
+    returned_at = datetime.now(timezone.utc)
+    returned = db.session.execute(
+        update(Borrow)
+        .where(Borrow.id == borrow_id, Borrow.return_date.is_(None))
+        .values(return_date=returned_at)
+    )
+    if returned.rowcount == 0:
+        db.session.rollback()
+        raise ValueError('Borrow already returned')
+
+    reservation_service.hand_off_copy(borrow.book_isbn, returned_at)
+    category_id = db.session.query(Book.category_id).filter(Book.isbn == borrow.book_isbn).scalar()
+    report_service.record_return(borrow.book_isbn, category_id, borrow.user_id, returned_at)
     db.session.commit()
+    invalidate_book(borrow.book_isbn)
     return borrow.to_dict()
 
 def get_borrows_by_user_id(user_id):
-    borrows = Borrow.query.filter_by(user_id=user_id).all()
-    return [borrow.to_dict() for borrow in borrows]
+    now = datetime.now(timezone.utc)
+    return _borrow_rows(now).filter(Borrow.user_id == user_id).all()
 
-def get_unreturned_borrows(page=1, per_page=10, search_member_name=None):
+def get_unreturned_borrows(page=1, per_page=10, search_member_name=None, cursor=None, include_total=True, fields=None):
     logger.info(f"get_unreturned_borrows called with page={page}, per_page={per_page}, search_member_name={search_member_name}")
-    query = Borrow.query.filter(Borrow.return_date.is_(None)).filter().join(User)
+    now = datetime.now(timezone.utc)
+    selected = with_sort_keys(fields, ('due_date', 'id')) if cursor is not None else fields
+    query = _borrow_rows(now, selected, join_user=bool(search_member_name)).filter(Borrow.return_date.is_(None))
     logger.info(f"Initial query: {query}")
     if search_member_name:
         query = query.filter(User.name.ilike(f'%{search_member_name}%'))
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
+    sort_columns = (Borrow.due_date, Borrow.id)
+
+    if cursor is not None:
+        items, next_cursor, total = keyset_paginate(
+            query, sort_columns, cursor=cursor, per_page=per_page, include_total=include_total
+        )
+        return {
+            'borrows': trim_rows(items, fields),
+            'total': total,
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor
+        }
+
+    pagination = query.order_by(*sort_columns).paginate(
+        page=page, per_page=per_page, error_out=False, count=include_total
+    )
     logger.info(f"Pagination result: total={pagination.total}, items={len(pagination.items)}")
     return {
-        'borrows': [borrow.to_dict() for borrow in pagination.items],
+        'borrows': pagination.items,
         'total': pagination.total,
-        'pages': pagination.pages,
+        'pages': pagination.pages if include_total else None,
         'current_page': pagination.page
     }
 
+def _days_since(now, column):
+    """Whole days from column to now, computed by the database."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return cast(func.floor(func.extract('epoch', literal(now) - column) / 86400), Integer)
+    return cast(func.julianday(literal(now)) - func.julianday(column), Integer)
+
+def get_overdue_borrows(page=1, per_page=10, cursor=None, include_total=True):
+    """Active borrows past their due date, most overdue first.
+
+    Filtering, ordering and the overdue day count all happen in SQL against
+    the partial ix_borrows_overdue index, using one timestamp for the whole
+    request.
+    """
+    now = datetime.now(timezone.utc)
+    query = _borrow_rows(now).filter(Borrow.return_date.is_(None), Borrow.due_date < now)
+    sort_columns = (Borrow.due_date, Borrow.id)
+
+    if cursor is not None:
+        items, next_cursor, total = keyset_paginate(
+            query, sort_columns, cursor=cursor, per_page=per_page, include_total=include_total
+        )
+        return {
+            'borrows': items,
+            'total': total,
+            'has_next': next_cursor is not None,
+            'next_cursor': next_cursor,
+            'as_of': now
+        }
+
+    pagination = query.order_by(*sort_columns).paginate(
+        page=page, per_page=per_page, error_out=False, count=include_total
+    )
+    return {
+        'borrows': pagination.items,
+        'total': pagination.total,
+        'pages': pagination.pages if include_total else None,
+        'current_page': pagination.page,
+        'as_of': now
+    }
+
 def delete_borrow_by_id(borrow_id):
     borrow = Borrow.query.get(borrow_id)
     if not borrow:
         return None
 
+    book_isbn = borrow.book_isbn
+    was_active = borrow.return_date is None
+    category_id = db.session.query(Book.category_id).filter(Book.isbn == book_isbn).scalar()
+    report_service.forget_borrow(borrow, category_id)
     db.session.delete(borrow)
+    if was_active:
+        reservation_service.hand_off_copy(book_isbn)
     db.session.commit()
+    invalidate_book(book_isbn)
     return True
@@ -1,15 +1,48 @@
 from ..models.category import Category
+from ..models.book import Book
 from ..extensions import db
+from ..common.cache import reference_cache
+from ..common.conditional import validated_versions
+from ..common.fields import select_fields
+from ..common.replica import read_only
+from sqlalchemy import func
 
-def get_all_categories():
-    categories = Category.query.all()
-    return [category.to_dict() for category in categories]
+# Fields of a category in list responses, in output order.
+CATEGORY_FIELDS = ('id', 'name', 'books_count')
+
+def _load_categories(fields):
+    # books_count comes from one grouped count, joined only when asked for.
+    counts = (
+        db.session.query(Book.category_id, func.count(Book.isbn).label('books_count'))
+        .group_by(Book.category_id)
+        .subquery()
+    )
+    columns = {'id': Category.id, 'name': Category.name, 'books_count': func.coalesce(counts.c.books_count, 0)}
+    query = db.session.query(*select_fields(columns, fields)).select_from(Category)
+    if fields is None or 'books_count' in fields:
+        query = query.outerjoin(counts, counts.c.category_id == Category.id)
+    return query.order_by(Category.id).all()
+
+@read_only
+def get_all_categories(fields=None):
+    return reference_cache.get_or_load(
+        'categories', ('all', fields), lambda: _load_categories(fields), version=validated_versions()
+    )
+
+def _count_books(category_id):
+    return db.session.query(func.count(Book.isbn)).filter(Book.category_id == category_id).scalar()
+
+def _invalidate_categories(books_changed=False):
+    reference_cache.invalidate('categories')
+    if books_changed:
+        # Cached books embed the category name.
+        reference_cache.invalidate('books')
 
 def get_category_by_id(category_id):
     category = Category.query.get(category_id)
     if not category:
         return None
-    return category.to_dict()
+    return category.to_dict(_count_books(category.id))
 
 def create_new_category(data):
     existing = Category.query.filter_by(name=data['name']).first()
@@ -20,7 +53,8 @@ def create_new_category(data):
 
     db.session.add(category)
     db.session.commit()
-    return category.to_dict()
+    _invalidate_categories()
+    return category.to_dict(0)
 
 def update_existing_category(category_id, data):
     category = Category.query.get(category_id)
@@ -40,7 +74,8 @@ def update_existing_category(category_id, data):
     category.name = data['name']
 
     db.session.commit()
-    return category.to_dict()
+    _invalidate_categories(books_changed=True)
+    return category.to_dict(_count_books(category.id))
 
 def delete_category_by_id(category_id):
     category = Category.query.get(category_id)
@@ -49,5 +84,6 @@ def delete_category_by_id(category_id):
 
     db.session.delete(category)
     db.session.commit()
+    _invalidate_categories(books_changed=True)
     return True
 
@@ -0,0 +1,276 @@
+import http.client
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+from flask import current_app
+from . import book_service
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LookupFailed(Exception):
+    """Raised when an ISBN could not be fetched after all retries."""
+
+
+class _HostPool:
+    """Keep-alive connections to one host; its size is the concurrency limit."""
+
+    def __init__(self, scheme, netloc, size, timeout):
+        self._factory = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        self._netloc = netloc
+        self._timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+
+    def request(self, path):
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._factory(self._netloc, timeout=self._timeout)
+            try:
+                connection.request('GET', path, headers={'Accept': 'application/json'})
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._idle.put(connection)
+            return response.status, response.getheader('Retry-After'), body
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class GoogleBooksClient:
+    """Concurrent ISBN lookups against the Google Books volumes API.
+
+    Lookups run on a thread pool over pooled keep-alive connections, with at
+    most ``per_host_limit`` requests in flight per host. Throttling and server
+    errors are retried with exponential backoff. Answers are kept on disk per
+    ISBN for ``cache_ttl`` seconds and "no match" answers for ``miss_ttl``
+    seconds, so importing the same list again makes no network calls while
+    ISBNs Google did not know yet are retried later. A TTL of 0 disables
+    that kind of entry.
+    """
+
+    def __init__(self, base_url, api_key=None, cache_dir=None, max_workers=8,
+                 per_host_limit=4, max_retries=3, backoff=0.5, timeout=10,
+                 cache_ttl=30 * 86400, miss_ttl=86400):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.miss_ttl = miss_ttl
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def normalize_isbn(isbn):
+        return re.sub(r'[^0-9Xx]', '', str(isbn)).upper()
+
+    def _pool(self, scheme, netloc):
+        with self._pools_lock:
+            pool = self._pools.get((scheme, netloc))
+            if pool is None:
+                pool = _HostPool(scheme, netloc, self.per_host_limit, self.timeout)
+                self._pools[(scheme, netloc)] = pool
+            return pool
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json') if self.cache_dir else None
+
+    def _read_cache(self, key):
+        path = self._cache_path(key)
+        if not path:
+            return False, None
+        try:
+            with open(path, encoding='utf-8') as f:
+                volume = json.load(f)
+            age = time.time() - os.path.getmtime(path)
+        except (OSError, ValueError):
+            # Missing, half-written or unreadable entries are fetched again.
+            return False, None
+        if age >= (self.cache_ttl if volume is not None else self.miss_ttl):
+            return False, None
+        return True, volume
+
+    def _write_cache(self, key, volume):
+        path = self._cache_path(key)
+        if not path or (self.cache_ttl if volume is not None else self.miss_ttl) <= 0:
+            return
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(volume, f)
+        os.replace(tmp, path)
+
+    def _get(self, params):
+        url = urlsplit(self.base_url)
+        path = f'{url.path or "/"}?{urlencode(params)}'
+        pool = self._pool(url.scheme, url.netloc)
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                status, retry_after, body = pool.request(path)
+            except (OSError, http.client.HTTPException) as e:
+                error = f'{type(e).__name__}: {e}'
+            else:
+                if status == 200:
+                    try:
+                        payload = json.loads(body)
+                    except ValueError as e:
+                        raise LookupFailed(f'Google Books returned invalid JSON ({e})')
+                    if not isinstance(payload, dict):
+                        raise LookupFailed('Google Books returned an unexpected response')
+                    return payload
+                if status not in RETRY_STATUSES:
+                    raise LookupFailed(f'Google Books returned HTTP {status}')
+                error = f'HTTP {status}'
+
+            if attempt == self.max_retries:
+                raise LookupFailed(f'Google Books lookup failed after {attempt + 1} attempts ({error})')
+            delay = self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            time.sleep(delay)
+
+    def fetch(self, isbn):
+        """Return the volumeInfo for an ISBN, or None when there is no match."""
+        key = self.normalize_isbn(isbn)
+        if not key:
+            return None
+        hit, volume = self._read_cache(key)
+        if hit:
+            return volume
+
+        params = {'q': f'isbn:{key}', 'maxResults': 1}
+        if self.api_key:
+            params['key'] = self.api_key
+        payload = self._get(params)
+        items = payload.get('items') or []
+        if not isinstance(items, list) or (items and not isinstance(items[0], dict)):
+            raise LookupFailed('Google Books returned an unexpected response')
+        volume = items[0].get('volumeInfo') if items else None
+        if volume is not None and not isinstance(volume, dict):
+            raise LookupFailed('Google Books returned an unexpected response')
+        self._write_cache(key, volume)
+        return volume
+
+    def fetch_many(self, isbns):
+        """Fetch several ISBNs concurrently.
+
+        Returns {isbn: volumeInfo | None | LookupFailed}.
+        """
+        def fetch_one(isbn):
+            try:
+                return isbn, self.fetch(isbn)
+            except LookupFailed as e:
+                logger.warning(f"Google Books lookup failed: isbn={isbn}: {e}")
+                return isbn, e
+
+        unique = list(dict.fromkeys(isbns))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as executor:
+            return dict(executor.map(fetch_one, unique))
+
+    def close(self):
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
+
+
+def get_client():
+    """The app's shared client, built from config on first use."""
+    app = current_app._get_current_object()
+    client = app.extensions.get('google_books')
+    if client is None:
+        config = app.config
+        client = GoogleBooksClient(
+            base_url=config['GOOGLE_BOOKS_API_URL'],
+            api_key=config.get('GOOGLE_BOOKS_API_KEY'),
+            cache_dir=config.get('GOOGLE_BOOKS_CACHE_DIR') or os.path.join(app.instance_path, 'google_books_cache'),
+            max_workers=config['GOOGLE_BOOKS_MAX_WORKERS'],
+            per_host_limit=config['GOOGLE_BOOKS_PER_HOST_LIMIT'],
+            max_retries=config['GOOGLE_BOOKS_MAX_RETRIES'],
+            timeout=config['GOOGLE_BOOKS_TIMEOUT'],
+            cache_ttl=config['GOOGLE_BOOKS_CACHE_TTL'],
+            miss_ttl=config['GOOGLE_BOOKS_CACHE_MISS_TTL'],
+        )
+        app.extensions['google_books'] = client
+    return client
+
+
+def _first(values):
+    """First entry of a list field from the API, or None when it is missing or not a list."""
+    return values[0] if isinstance(values, list) and values else None
+
+
+def volume_to_book(isbn, volume, total_copies=1):
+    """Map a Google Books volumeInfo to the fields import_book_from_google takes."""
+    image_links = volume.get('imageLinks')
+    if not isinstance(image_links, dict):
+        image_links = {}
+    return {
+        'isbn': isbn,
+        'title': volume.get('title'),
+        'author_name': _first(volume.get('authors')),
+        'category_name': _first(volume.get('categories')),
+        'total_copies': total_copies,
+        'cover': image_links.get('thumbnail'),
+        'description': volume.get('description'),
+    }
+
+
+def import_books_by_isbn(isbns, total_copies=1, client=None):
+    """Look up ISBNs concurrently and import the matches in one bulk load.
+
+    Network lookups run in parallel; the database writes stay on the calling
+    thread and go through book_service.bulk_import_books.
+    """
+    client = client or get_client()
+    isbns = [str(isbn).strip() for isbn in isbns if str(isbn).strip()]
+    volumes = client.fetch_many(isbns)
+
+    records = []
+    for isbn in isbns:
+        volume = volumes.get(isbn)
+        if isinstance(volume, LookupFailed):
+            records.append(ValueError(str(volume)))
+        elif volume is None:
+            records.append(ValueError(f"No Google Books match for ISBN '{isbn}'"))
+        else:
+            records.append(volume_to_book(isbn, volume, total_copies))
+
+    report = book_service.bulk_import_books(
+        records, chunk_size=current_app.config['BULK_IMPORT_CHUNK_SIZE']
+    )
+    for error in report['errors']:
+        if error['isbn'] is None:
+            error['isbn'] = isbns[error['row'] - 1]
+    return report
@@ -0,0 +1,166 @@
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import or_, select, update
+from ..extensions import db
+from ..common.upsert import dialect_insert
+from ..models.job import Job
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def handler(kind):
+    """Register the function that runs jobs of this kind; it gets the payload."""
+    def decorator(fn):
+        _handlers[kind] = fn
+        return fn
+    return decorator
+
+
+def enqueue_many(jobs):
+    """Queue several jobs in one statement, skipping any whose dedupe_key exists.
+
+    ``jobs`` are dicts with kind, payload and optionally dedupe_key and run_at.
+    Runs in the caller's transaction. Returns the number of jobs created.
+    """
+    if not jobs:
+        return 0
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            'kind': job['kind'],
+            'payload': job.get('payload') or {},
+            'dedupe_key': job.get('dedupe_key'),
+            'run_at': job.get('run_at') or now,
+            'max_attempts': current_app.config['JOB_MAX_ATTEMPTS'],
+            'status': Job.PENDING,
+            'attempts': 0,
+            'created_at': now,
+        }
+        for job in jobs
+    ]
+    insert = dialect_insert(db.session.get_bind().dialect.name)
+    if insert is None:
+        raise NotImplementedError('The job queue needs PostgreSQL or SQLite')
+    statement = (
+        insert(Job.__table__)
+        .on_conflict_do_nothing(index_elements=['dedupe_key'])
+        .returning(Job.__table__.c.id)
+    )
+    return len(db.session.execute(statement, rows).all())
+
+
+def enqueue(kind, payload=None, dedupe_key=None, run_at=None):
+    return enqueue_many([{'kind': kind, 'payload': payload, 'dedupe_key': dedupe_key, 'run_at': run_at}]) == 1
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_jobs(worker, limit):
+    """Mark up to ``limit`` due jobs as running for this worker and return them.
+
+    On PostgreSQL the candidates are locked with FOR UPDATE SKIP LOCKED, so
+    concurrent workers never pick the same job. Jobs whose worker died
+    (running for longer than JOB_LOCK_TIMEOUT) become claimable again.
+    """
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=current_app.config['JOB_LOCK_TIMEOUT'])
+    candidates = (
+        select(Job.id)
+        .where(Job.run_at <= now)
+        .where(or_(Job.status == Job.PENDING, (Job.status == Job.RUNNING) & (Job.locked_at < stale)))
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    ids = db.session.execute(candidates).scalars().all()
+    if not ids:
+        db.session.rollback()
+        return []
+
+    claimed = db.session.execute(
+        update(Job)
+        .where(Job.id.in_(ids))
+        .where(or_(Job.status == Job.PENDING, (Job.status == Job.RUNNING) & (Job.locked_at < stale)))
+        .values(status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=Job.attempts + 1)
+        .returning(Job.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.session.commit()
+    if not claimed:
+        return []
+    return Job.query.filter(Job.id.in_(claimed)).order_by(Job.run_at, Job.id).all()
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=current_app.config['JOB_RETRY_BACKOFF'] * 2 ** (attempts - 1))
+
+
+def run_job(job):
+    """Run one claimed job and record the outcome; failures are retried with backoff."""
+    now = datetime.now(timezone.utc)
+    try:
+        run = _handlers.get(job.kind)
+        if run is None:
+            raise LookupError(f"No handler for job kind '{job.kind}'")
+        run(job.payload)
+    except Exception as e:
+        db.session.rollback()
+        job = db.session.get(Job, job.id)
+        job.last_error = f'{type(e).__name__}: {e}'
+        job.locked_by = job.locked_at = None
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            job.finished_at = now
+            logger.error(f"Job {job.id} ({job.kind}) failed permanently: {job.last_error}")
+        else:
+            job.status = Job.PENDING
+            job.run_at = now + _retry_delay(job.attempts)
+            logger.warning(f"Job {job.id} ({job.kind}) failed, retrying at {job.run_at}: {job.last_error}")
+        db.session.commit()
+        return False
+
+    job.status = Job.DONE
+    job.finished_at = now
+    job.locked_by = job.locked_at = None
+    job.last_error = None
+    db.session.commit()
+    return True
+
+
+def run_worker(worker=None, burst=False, poll_interval=None, batch_size=None):
+    """Claim and run jobs until stopped; with ``burst`` stop once the queue is empty.
+
+    Returns the number of jobs processed.
+    """
+    worker = worker or worker_name()
+    poll_interval = poll_interval or current_app.config['JOB_POLL_INTERVAL']
+    batch_size = batch_size or current_app.config['JOB_BATCH_SIZE']
+    processed = 0
+    logger.info(f"Job worker {worker} started")
+    while True:
+        jobs = claim_jobs(worker, batch_size)
+        for job in jobs:
+            run_job(job)
+            processed += 1
+        if not jobs:
+            if burst:
+                return processed
+            time.sleep(poll_interval)
+
+
+def purge_finished(older_than_days):
+    """Delete done and failed jobs finished more than ``older_than_days`` ago."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    deleted = Job.query.filter(
+        Job.status.in_([Job.DONE, Job.FAILED]), Job.finished_at < cutoff
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,110 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import tuple_
+from ..extensions import db
+from ..common.dates import as_utc
+from ..common.notifications import get_sender
+from ..models.borrow import Borrow
+from . import job_service
+
+logger = logging.getLogger(__name__)
+
+DUE_SOON = 'borrow.due_soon'
+OVERDUE = 'borrow.overdue'
+
+
+def _iter_active_borrows(start, end, batch_size):
+    """Yield (id, due_date) of unreturned borrows with start <= due_date < end.
+
+    Walks the partial ix_borrows_overdue index in (due_date, id) order one
+    batch at a time, so no batch holds more than batch_size rows.
+    """
+    after = None
+    while True:
+        query = (
+            db.session.query(Borrow.id, Borrow.due_date)
+            .filter(Borrow.return_date.is_(None), Borrow.due_date < end)
+        )
+        if start is not None:
+            query = query.filter(Borrow.due_date >= start)
+        if after is not None:
+            query = query.filter(tuple_(Borrow.due_date, Borrow.id) > tuple_(*after))
+        rows = query.order_by(Borrow.due_date, Borrow.id).limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        after = (rows[-1].due_date, rows[-1].id)
+
+
+def scan_borrows(now=None, batch_size=None):
+    """Queue due-soon and overdue reminders for every unreturned borrow.
+
+    A due-soon reminder is queued once per borrow; an overdue reminder at most
+    once per borrow per day. Every batch is committed on its own, so a long
+    scan never holds one big transaction. Meant for the scheduler or the CLI,
+    never for a request. Returns the number of jobs created per kind.
+    """
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or current_app.config['REMINDER_SCAN_BATCH_SIZE']
+    due_soon_until = now + timedelta(days=current_app.config['REMINDER_DUE_SOON_DAYS'])
+    today = now.date().isoformat()
+    created = {DUE_SOON: 0, OVERDUE: 0}
+
+    for rows in _iter_active_borrows(now, due_soon_until, batch_size):
+        created[DUE_SOON] += job_service.enqueue_many([
+            {'kind': DUE_SOON, 'payload': {'borrow_id': borrow_id}, 'dedupe_key': f'{DUE_SOON}:{borrow_id}'}
+            for borrow_id, _ in rows
+        ])
+        db.session.commit()
+
+    for rows in _iter_active_borrows(None, now, batch_size):
+        created[OVERDUE] += job_service.enqueue_many([
+            {'kind': OVERDUE, 'payload': {'borrow_id': borrow_id}, 'dedupe_key': f'{OVERDUE}:{borrow_id}:{today}'}
+            for borrow_id, _ in rows
+        ])
+        db.session.commit()
+
+    logger.info(f"Reminder scan queued {created[DUE_SOON]} due-soon and {created[OVERDUE]} overdue job(s)")
+    return created
+
+
+def _notify(kind, borrow_id):
+    borrow = db.session.get(Borrow, borrow_id)
+    if borrow is None or borrow.return_date is not None:
+        # Returned or deleted since the job was queued.
+        return
+    now = datetime.now(timezone.utc)
+    due_date = as_utc(borrow.due_date)
+    title = borrow.book.title if borrow.book else borrow.book_isbn
+
+    if kind == OVERDUE:
+        if due_date > now:
+            return
+        days = borrow.days_overdue_at(now)
+        subject = f'"{title}" is overdue'
+        body = f'"{title}" was due on {due_date.date().isoformat()} and is {days} day(s) overdue. Please return it.'
+    else:
+        subject = f'"{title}" is due soon'
+        body = f'"{title}" is due on {due_date.date().isoformat()}.'
+
+    get_sender().send({
+        'kind': kind,
+        'to': borrow.user.email,
+        'name': borrow.user.name,
+        'subject': subject,
+        'body': body,
+        'borrow_id': borrow.id,
+        'book_isbn': borrow.book_isbn,
+        'due_date': due_date.isoformat(),
+    })
+
+
+@job_service.handler(DUE_SOON)
+def send_due_soon(payload):
+    _notify(DUE_SOON, payload['borrow_id'])
+
+
+@job_service.handler(OVERDUE)
+def send_overdue(payload):
+    _notify(OVERDUE, payload['borrow_id'])
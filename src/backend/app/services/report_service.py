@@ -0,0 +1,254 @@
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import Date, cast, delete, func, literal, select
+from ..extensions import db
+from ..common.dates import as_utc
+from ..common.upsert import dialect_insert, upsert_increment
+from ..common.replica import read_only
+from ..models.book import Book
+from ..models.borrow import Borrow
+from ..models.category import Category
+from ..models.user import User
+from ..models.job import Job
+from ..models.report import DailyBookStats, DailyCategoryStats, DailyMemberStats
+from . import job_service
+
+DEFAULT_WINDOW_DAYS = 30
+
+ROLLUP_JOB = 'reports.rollup'
+
+ROLLUPS = (
+    (DailyBookStats, 'book_isbn'),
+    (DailyCategoryStats, 'category_id'),
+    (DailyMemberStats, 'user_id'),
+)
+
+
+def _record(day, book_isbn, category_id, user_id, counter, delta=1):
+    # Only a job row is inserted here. Upserting the rollup rows directly
+    # would hold their locks until COMMIT, serializing every borrow in the
+    # same category; the job worker applies the deltas in its own
+    # transactions instead, so the reports trail the ledger by the queue.
+    job_service.enqueue(ROLLUP_JOB, {
+        'day': day.isoformat(), 'book_isbn': book_isbn, 'category_id': category_id,
+        'user_id': user_id, 'counter': counter, 'delta': delta,
+    })
+
+
+@job_service.handler(ROLLUP_JOB)
+def apply_rollup(payload):
+    """Add one queued borrow/return delta to the daily rollups, in ROLLUPS order."""
+    day = date.fromisoformat(payload['day'])
+    for model, key in ROLLUPS:
+        if payload[key] is None:
+            continue
+        upsert_increment(
+            db.session, model.__table__, {'day': day, key: payload[key]}, {payload['counter']: payload['delta']}
+        )
+
+
+def record_borrow(book_isbn, category_id, user_id, when):
+    """Queue a new borrow for the daily rollups (caller's transaction)."""
+    _record(as_utc(when).date(), book_isbn, category_id, user_id, 'borrows')
+
+
+def record_return(book_isbn, category_id, user_id, when):
+    """Queue a return for the daily rollups (caller's transaction)."""
+    _record(as_utc(when).date(), book_isbn, category_id, user_id, 'returns')
+
+
+def forget_borrow(borrow, category_id):
+    """Queue taking a deleted borrow, and its return if it had one, out of the rollups (caller's transaction).
+
+    Going through the queue like the increments keeps the sums exact even
+    when the borrow's own rollup job has not run yet.
+    """
+    for counter, when in (('borrows', borrow.borrow_date), ('returns', borrow.return_date)):
+        if when is not None:
+            _record(as_utc(when).date(), borrow.book_isbn, category_id, borrow.user_id, counter, delta=-1)
+
+
+def _day(column):
+    """UTC calendar day of a timestamp column, as a DATE."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return cast(func.timezone('UTC', column), Date)
+    return func.date(column)
+
+
+def backfill_rollups():
+    """Rebuild every rollup table from the borrows history.
+
+    Each table is emptied and refilled with two grouped INSERT ... SELECTs
+    (borrows by borrow day, then returns by return day), all in one
+    transaction. Pending rollup jobs are dropped in the same transaction,
+    since the ledger already includes their borrows and returns. Returns
+    the number of rollup rows per table.
+    """
+    upsert = dialect_insert(db.session.get_bind().dialect.name)
+    if upsert is None:
+        raise NotImplementedError('Report backfill needs PostgreSQL or SQLite')
+
+    sources = {
+        'book_isbn': Borrow.book_isbn,
+        'category_id': Book.category_id,
+        'user_id': Borrow.user_id,
+    }
+    counts = {}
+    try:
+        db.session.execute(delete(Job).where(Job.kind == ROLLUP_JOB, Job.status == Job.PENDING))
+        for model, key in ROLLUPS:
+            table = model.__table__
+            source = sources[key]
+            db.session.execute(delete(table))
+
+            for counter, date_column, condition in (
+                ('borrows', Borrow.borrow_date, Borrow.borrow_date.isnot(None)),
+                ('returns', Borrow.return_date, Borrow.return_date.isnot(None)),
+            ):
+                day = _day(date_column)
+                grouped = select(day, source, func.count(Borrow.id), literal(0))
+                if key == 'category_id':
+                    grouped = grouped.join(Book, Book.isbn == Borrow.book_isbn)
+                grouped = grouped.where(condition).group_by(day, source)
+
+                other = 'returns' if counter == 'borrows' else 'borrows'
+                statement = upsert(table).from_select(['day', key, counter, other], grouped)
+                statement = statement.on_conflict_do_update(
+                    index_elements=['day', key],
+                    set_={counter: table.c[counter] + statement.excluded[counter]},
+                )
+                db.session.execute(statement)
+
+            counts[table.name] = db.session.query(func.count()).select_from(table).scalar()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return counts
+
+
+def _window(since=None, until=None):
+    """Inclusive day range; defaults to the last DEFAULT_WINDOW_DAYS days."""
+    until = until.date() if until else datetime.now(timezone.utc).date()
+    since = since.date() if since else until - timedelta(days=DEFAULT_WINDOW_DAYS - 1)
+    if since > until:
+        raise ValueError("'since' must not be after 'until'")
+    return since, until
+
+
+def _period(since, until):
+    return {'since': since, 'until': until}
+
+
+@read_only
+def most_borrowed_books(since=None, until=None, limit=10):
+    since, until = _window(since, until)
+    totals = (
+        db.session.query(
+            DailyBookStats.book_isbn,
+            func.sum(DailyBookStats.borrows).label('borrows'),
+            func.sum(DailyBookStats.returns).label('returns')
+        )
+        .filter(DailyBookStats.day.between(since, until))
+        .group_by(DailyBookStats.book_isbn)
+        .order_by(func.sum(DailyBookStats.borrows).desc(), DailyBookStats.book_isbn)
+        .limit(limit)
+        .subquery()
+    )
+    rows = (
+        db.session.query(totals.c.book_isbn, Book.title, totals.c.borrows, totals.c.returns)
+        .outerjoin(Book, Book.isbn == totals.c.book_isbn)
+        .order_by(totals.c.borrows.desc(), totals.c.book_isbn)
+        .all()
+    )
+    return {
+        'period': _period(since, until),
+        'books': [
+            {'isbn': isbn, 'title': title, 'borrows': int(borrows), 'returns': int(returns)}
+            for isbn, title, borrows, returns in rows
+        ]
+    }
+
+
+@read_only
+def category_statistics(since=None, until=None):
+    since, until = _window(since, until)
+    totals = (
+        db.session.query(
+            DailyCategoryStats.category_id,
+            func.sum(DailyCategoryStats.borrows).label('borrows'),
+            func.sum(DailyCategoryStats.returns).label('returns')
+        )
+        .filter(DailyCategoryStats.day.between(since, until))
+        .group_by(DailyCategoryStats.category_id)
+        .subquery()
+    )
+    rows = (
+        db.session.query(totals.c.category_id, Category.name, totals.c.borrows, totals.c.returns)
+        .outerjoin(Category, Category.id == totals.c.category_id)
+        .order_by(totals.c.borrows.desc(), totals.c.category_id)
+        .all()
+    )
+    return {
+        'period': _period(since, until),
+        'categories': [
+            {'id': category_id, 'name': name, 'borrows': int(borrows), 'returns': int(returns)}
+            for category_id, name, borrows, returns in rows
+        ]
+    }
+
+
+@read_only
+def member_activity(since=None, until=None, limit=10):
+    since, until = _window(since, until)
+    totals = (
+        db.session.query(
+            DailyMemberStats.user_id,
+            func.sum(DailyMemberStats.borrows).label('borrows'),
+            func.sum(DailyMemberStats.returns).label('returns'),
+            func.count(DailyMemberStats.day).label('active_days')
+        )
+        .filter(DailyMemberStats.day.between(since, until))
+        .group_by(DailyMemberStats.user_id)
+        .order_by(func.sum(DailyMemberStats.borrows).desc(), DailyMemberStats.user_id)
+        .limit(limit)
+        .subquery()
+    )
+    rows = (
+        db.session.query(totals.c.user_id, User.name, totals.c.borrows, totals.c.returns, totals.c.active_days)
+        .outerjoin(User, User.id == totals.c.user_id)
+        .order_by(totals.c.borrows.desc(), totals.c.user_id)
+        .all()
+    )
+    return {
+        'period': _period(since, until),
+        'members': [
+            {
+                'user_id': user_id, 'name': name, 'borrows': int(borrows),
+                'returns': int(returns), 'active_days': active_days
+            }
+            for user_id, name, borrows, returns, active_days in rows
+        ]
+    }
+
+
+@read_only
+def daily_totals(since=None, until=None):
+    since, until = _window(since, until)
+    rows = (
+        db.session.query(
+            DailyCategoryStats.day,
+            func.sum(DailyCategoryStats.borrows),
+            func.sum(DailyCategoryStats.returns)
+        )
+        .filter(DailyCategoryStats.day.between(since, until))
+        .group_by(DailyCategoryStats.day)
+        .order_by(DailyCategoryStats.day)
+        .all()
+    )
+    return {
+        'period': _period(since, until),
+        'days': [
+            {'day': day, 'borrows': int(borrows), 'returns': int(returns)}
+            for day, borrows, returns in rows
+        ]
+    }
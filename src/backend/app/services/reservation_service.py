@@ -0,0 +1,266 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from ..extensions import db
+from ..common.dates import as_utc
+from ..common.notifications import get_sender
+from ..models.book import Book
+from ..models.borrow import Borrow
+from ..models.reservation import Reservation
+from ..models.user import User
+from .book_service import invalidate_book
+from . import job_service
+
+logger = logging.getLogger(__name__)
+
+READY_NOTIFICATION = 'reservation.ready'
+
+
+def _queue_position(reservation):
+    """1-based place in the book's queue, 0 once a copy is held, None when closed.
+
+    Counts the waiting reservations ahead of this one with a range scan on
+    ix_reservations_queue (book_isbn, created_at, id). That is an index-only
+    scan over the partial index of waiting rows, but it is O(position), not a
+    constant-time lookup: it reads one index entry per reservation ahead.
+    A stored ordinal would make the read O(1), but every cancellation or
+    expiry would then have to renumber the rest of the queue, and queues
+    are short compared to the catalog, so the count is kept.
+    """
+    if reservation.status == Reservation.READY:
+        return 0
+    if reservation.status != Reservation.WAITING:
+        return None
+    ahead = (
+        db.session.query(db.func.count(Reservation.id))
+        .filter(
+            Reservation.book_isbn == reservation.book_isbn,
+            Reservation.status == Reservation.WAITING,
+            tuple_(Reservation.created_at, Reservation.id) < tuple_(reservation.created_at, reservation.id)
+        )
+        .scalar()
+    )
+    return ahead + 1
+
+
+def join_queue(user_id, book_isbn):
+    if not book_isbn:
+        raise ValueError('book_isbn is required')
+    if not User.query.get(user_id):
+        raise ValueError('User not found')
+    book = Book.query.get(book_isbn)
+    if not book:
+        raise ValueError('Book not found')
+    if book.available_copies > 0:
+        raise ValueError('Copies are available; borrow the book instead')
+
+    borrowed = Borrow.query.filter(
+        Borrow.user_id == user_id, Borrow.book_isbn == book_isbn, Borrow.return_date.is_(None)
+    ).first()
+    if borrowed:
+        raise ValueError('You already have this book borrowed')
+
+    reservation = Reservation(user_id=user_id, book_isbn=book_isbn)
+    db.session.add(reservation)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise ValueError('You already have a reservation for this book')
+    logger.info(f"Reservation created: id={reservation.id}, user_id={user_id}, book_isbn={book_isbn}")
+    return reservation.to_dict(_queue_position(reservation))
+
+
+def get_reservation(reservation_id):
+    return Reservation.query.get(reservation_id)
+
+
+def reservation_details(reservation):
+    return reservation.to_dict(_queue_position(reservation))
+
+
+def get_user_reservations(user_id):
+    reservations = (
+        Reservation.query
+        .filter(Reservation.user_id == user_id, Reservation.status.in_(Reservation.OPEN))
+        .order_by(Reservation.created_at, Reservation.id)
+        .all()
+    )
+    return [reservation_details(reservation) for reservation in reservations]
+
+
+def leave_queue(reservation):
+    """Cancel an open reservation; a copy held for it goes to the next in line."""
+    now = datetime.now(timezone.utc)
+    closed = db.session.execute(
+        update(Reservation)
+        .where(Reservation.id == reservation.id, Reservation.status.in_(Reservation.OPEN))
+        .values(status=Reservation.CANCELLED, closed_at=now)
+        .returning(Reservation.status)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if closed is None:
+        db.session.rollback()
+        raise ValueError('Reservation is no longer open')
+
+    was_ready = reservation.status == Reservation.READY
+    if was_ready:
+        hand_off_copy(reservation.book_isbn, now)
+    db.session.commit()
+    if was_ready:
+        invalidate_book(reservation.book_isbn)
+    db.session.refresh(reservation)
+    return reservation.to_dict()
+
+
+def _hold_for_next(book_isbn, now):
+    """Mark the oldest waiting reservation ready; returns its id or None."""
+    head = db.session.execute(
+        select(Reservation.id)
+        .where(Reservation.book_isbn == book_isbn, Reservation.status == Reservation.WAITING)
+        .order_by(Reservation.created_at, Reservation.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar()
+    if head is None:
+        return None
+
+    hold_days = current_app.config['RESERVATION_HOLD_DAYS']
+    held = db.session.execute(
+        update(Reservation)
+        .where(Reservation.id == head, Reservation.status == Reservation.WAITING)
+        .values(status=Reservation.READY, ready_at=now, expires_at=now + timedelta(days=hold_days))
+        .execution_options(synchronize_session=False)
+    )
+    if held.rowcount == 0:
+        return None
+    job_service.enqueue(
+        READY_NOTIFICATION, {'reservation_id': head}, dedupe_key=f'{READY_NOTIFICATION}:{head}'
+    )
+    return head
+
+
+def hand_off_copy(book_isbn, now=None):
+    """A copy came back: hold it for the next reservation, else return it to the shelf.
+
+    Runs in the caller's transaction, so a return and the hand-off it causes
+    commit together.
+    """
+    now = now or datetime.now(timezone.utc)
+    reservation_id = _hold_for_next(book_isbn, now)
+    if reservation_id is not None:
+        logger.info(f"Copy of {book_isbn} held for reservation {reservation_id}")
+        return reservation_id
+
+    # Never go above total_copies.
+    db.session.execute(
+        update(Book)
+        .where(Book.isbn == book_isbn, Book.available_copies < Book.total_copies)
+        .values(available_copies=Book.available_copies + 1)
+        .execution_options(table_version='book_copies')
+    )
+    return None
+
+
+def take_held_copy(user_id, book_isbn):
+    """Fulfil the member's ready reservation, if any; True when a held copy was used."""
+    now = datetime.now(timezone.utc)
+    taken = db.session.execute(
+        update(Reservation)
+        .where(
+            Reservation.user_id == user_id,
+            Reservation.book_isbn == book_isbn,
+            Reservation.status == Reservation.READY,
+            Reservation.expires_at > now
+        )
+        .values(status=Reservation.FULFILLED, closed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return taken.rowcount > 0
+
+
+def expire_holds(now=None, batch_size=100):
+    """Expire holds that were not picked up and pass their copies on.
+
+    Also hands shelf copies to waiting reservations, which covers copies
+    added to a book while members were queued. Meant for the scheduler.
+    Returns the number of expired holds and of new holds made.
+    """
+    now = now or datetime.now(timezone.utc)
+    expired = 0
+    while True:
+        rows = (
+            db.session.query(Reservation.id, Reservation.book_isbn)
+            .filter(Reservation.status == Reservation.READY, Reservation.expires_at <= now)
+            .order_by(Reservation.expires_at, Reservation.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        for reservation_id, book_isbn in rows:
+            closed = db.session.execute(
+                update(Reservation)
+                .where(Reservation.id == reservation_id, Reservation.status == Reservation.READY)
+                .values(status=Reservation.EXPIRED, closed_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if closed.rowcount:
+                hand_off_copy(book_isbn, now)
+                expired += 1
+        db.session.commit()
+        for _, book_isbn in rows:
+            invalidate_book(book_isbn)
+
+    waiting_books = (
+        db.session.query(Book.isbn)
+        .filter(Book.available_copies > 0)
+        .filter(
+            db.session.query(Reservation.id)
+            .filter(Reservation.book_isbn == Book.isbn, Reservation.status == Reservation.WAITING)
+            .exists()
+        )
+        .all()
+    )
+    held = 0
+    for (book_isbn,) in waiting_books:
+        while True:
+            taken = db.session.execute(
+                update(Book)
+                .where(Book.isbn == book_isbn, Book.available_copies > 0)
+                .values(available_copies=Book.available_copies - 1)
+                .execution_options(table_version='book_copies')
+            )
+            if taken.rowcount == 0:
+                break
+            if _hold_for_next(book_isbn, now) is None:
+                db.session.rollback()
+                break
+            db.session.commit()
+            held += 1
+        invalidate_book(book_isbn)
+
+    if expired or held:
+        logger.info(f"Reservation holds: {expired} expired, {held} new")
+    return {'expired': expired, 'held': held}
+
+
+@job_service.handler(READY_NOTIFICATION)
+def send_ready_notification(payload):
+    reservation = db.session.get(Reservation, payload['reservation_id'])
+    if reservation is None or reservation.status != Reservation.READY:
+        return
+    title = reservation.book.title if reservation.book else reservation.book_isbn
+    expires_at = as_utc(reservation.expires_at)
+    get_sender().send({
+        'kind': READY_NOTIFICATION,
+        'to': reservation.user.email,
+        'name': reservation.user.name,
+        'subject': f'"{title}" is ready for you',
+        'body': f'A copy of "{title}" is being held for you until {expires_at.date().isoformat()}.',
+        'reservation_id': reservation.id,
+        'book_isbn': reservation.book_isbn,
+        'expires_at': expires_at.isoformat(),
+    })
@@ -1,9 +1,44 @@
 from ..models.user import User , UserRole
 from ..extensions import db
+from ..common.cache import reference_cache
+from ..common.fields import select_fields
+from sqlalchemy.orm import make_transient_to_detached
 
-def get_all_users():
-    users = User.query.all()
-    return [user.to_dict() for user in users]
+def _load_user_row(user_id):
+    user = User.query.get(user_id)
+    if not user:
+        return None
+    return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+def get_cached_user(user_id):
+    """Return the User for user_id, served from the bounded user cache.
+
+    The cache holds plain column values; they are merged back into the
+    current session without a query, so the result behaves like a loaded row.
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    row = reference_cache.get_or_load('users', user_id, lambda: _load_user_row(user_id))
+    if row is None:
+        return None
+    user = User.__mapper__.class_manager.new_instance()
+    for key, value in row.items():
+        setattr(user, key, value)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+def invalidate_user(user_id):
+    reference_cache.invalidate('users', int(user_id))
+
+# Fields of a user in list responses, in output order.
+USER_COLUMNS = {'id': User.id, 'name': User.name, 'email': User.email, 'role': User.role}
+USER_FIELDS = tuple(USER_COLUMNS)
+
+def get_all_users(fields=None):
+    """Every user as a result row holding only ``fields`` (all when None)."""
+    return db.session.query(*select_fields(USER_COLUMNS, fields)).select_from(User).all()
 
 def get_user_by_id(user_id):
     user = User.query.get(user_id)
@@ -25,26 +60,38 @@ def create_new_user(data):
     db.session.commit()
     return user.to_dict()
 
+def _load_for_write(user_id):
+    # The identity map may hold the caller's row merged from the user cache
+    # without a query; refresh it so a stale copy is never written back.
+    return db.session.get(User, user_id, populate_existing=True)
+
 def update_existing_user(user_id, data):
-    user = User.query.get(user_id)
+    user = _load_for_write(user_id)
     if not user:
         return None
 
+    previous_role = str(user.role)
     for field in ('name', 'email', 'role'):
         if field in data:
             setattr(user, field, data[field])
 
+    revoke_tokens = str(user.role) != previous_role
     if 'password' in data and data['password']:
         user.set_password(data['password'])
+        revoke_tokens = True
+    if revoke_tokens:
+        user.token_version = (user.token_version or 0) + 1
 
     db.session.commit()
+    invalidate_user(user_id)
     return user.to_dict()
 
 def delete_user_by_id(user_id):
-    user = User.query.get(user_id)
+    user = _load_for_write(user_id)
     if not user:
         return None
 
     db.session.delete(user)
     db.session.commit()
+    invalidate_user(user_id)
     return True
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+API benchmark suite for Quill.
+
+Builds the app with create_app against a seeded database and drives the hot
+endpoints through the WSGI test client, so the numbers cover routing,
+services, serialization and SQL but not the network or the HTTP server.
+Results (latency percentiles, throughput, queries per request) are written
+to JSON; pass --compare with an earlier result file to print the change.
+
+    cd src/backend
+    python -m benchmarks.bench --database sqlite:////tmp/quill-bench.db --books 5000 \\
+        --requests 300 --out bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+SCENARIOS = (
+    'books_list', 'books_cursor', 'search', 'book_detail', 'login',
+    'borrow', 'return', 'unreturned',
+)
+_SERVER_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Quill API.')
+    parser.add_argument('--database', help='Database URL (default: a fresh SQLite file in a temp dir)')
+    parser.add_argument('--books', type=int, default=2000, help='Generated books on top of the sample data')
+    parser.add_argument('--borrows', type=int, default=2000, help='Generated unreturned borrows')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=1, help='Client threads per scenario')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated subset to run')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the in-process reference cache')
+    parser.add_argument('--bcrypt-rounds', type=int, default=12, help='bcrypt cost for login')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for request parameters')
+    parser.add_argument('--out', default='bench.json', help='Where to write the JSON results')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    """Config is read from the environment at import time, so set it first."""
+    database = args.database or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'quill-bench.db')}"
+    os.environ['DATABASE_URL'] = database
+    os.environ.setdefault('DEBUG', 'false')
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret')
+    os.environ.setdefault('JWT_ACCESS_TOKEN_EXPIRES', '3600')
+    os.environ['SQL_INSTRUMENTATION'] = 'true'
+    os.environ['SQL_N_PLUS_ONE_THRESHOLD'] = '1000000'
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(args.bcrypt_rounds)
+    os.environ.setdefault('PASSWORD_HASH_QUEUE_DEPTH', str(max(args.concurrency * 2, 8)))
+    if args.no_cache:
+        for name in ('AUTHORS', 'CATEGORIES', 'BOOKS', 'USERS'):
+            os.environ[f'CACHE_TTL_{name}'] = '0'
+    return database
+
+
+def seed(app, books, borrows):
+    """Load the sample data, then generated books and open borrows."""
+    from seed_database import seed_database
+    from app.extensions import db
+    from app.models import Book, Borrow, User
+    from app.services import book_service
+
+    seed_database()
+    with app.app_context():
+        existing = Book.query.filter(Book.isbn.like('BENCH-%')).count()
+        if existing < books:
+            rng = random.Random(0)
+            words = ['Silent', 'River', 'Glass', 'Empire', 'Winter', 'Garden', 'Shadow', 'Harbor',
+                     'Iron', 'Letters', 'Storm', 'Orchard', 'Night', 'Atlas', 'Crown', 'Ember']
+            records = [
+                {
+                    'isbn': f'BENCH-{i:08d}',
+                    'title': ' '.join(rng.sample(words, 3)) + f' {i}',
+                    'author_name': f'Author {i % 500}',
+                    'category_name': f'Category {i % 25}',
+                    'total_copies': 5,
+                }
+                for i in range(existing, books)
+            ]
+            book_service.bulk_import_books(records, chunk_size=app.config['BULK_IMPORT_CHUNK_SIZE'])
+
+        open_borrows = Borrow.query.filter(Borrow.return_date.is_(None)).count()
+        if open_borrows < borrows:
+            members = [u.id for u in User.query.filter_by(role='member')]
+            isbns = [isbn for (isbn,) in db.session.query(Book.isbn).filter(Book.isbn.like('BENCH-%'))]
+            now = datetime.now(timezone.utc)
+            rng = random.Random(1)
+            rows = []
+            for i in range(borrows - open_borrows):
+                borrowed = now - timedelta(days=rng.randint(0, 30), minutes=i)
+                rows.append({
+                    'user_id': rng.choice(members),
+                    'book_isbn': rng.choice(isbns),
+                    'borrow_date': borrowed,
+                    'due_date': borrowed + timedelta(days=app.config['BORROWING_LIMIT_DAYS']),
+                })
+            db.session.execute(Borrow.__table__.insert(), rows)
+            db.session.commit()
+            book_service.reconcile_available_copies(fix=True)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    low, high = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (k - low)
+
+
+class Scenario:
+    """Issues one kind of request; ``request(client, rng)`` returns the response."""
+
+    def __init__(self, name, request):
+        self.name = name
+        self.request = request
+
+
+def build_scenarios(app, names):
+    from app.extensions import db
+    from app.models import Book
+
+    client = app.test_client()
+
+    def login(email, password):
+        response = client.post('/auth/login', json={'email': email, 'password': password})
+        return {'Authorization': f"Bearer {response.get_json()['data']['access_token']}"}
+
+    member = login('john.doe@email.com', 'member123')
+    librarian = login('librarian@quill.com', 'librarian123')
+
+    with app.app_context():
+        isbns = [isbn for (isbn,) in db.session.query(Book.isbn).filter(Book.isbn.like('BENCH-%'))]
+        titles = [title for (title,) in db.session.query(Book.title).limit(500)]
+        pages = max(1, db.session.query(db.func.count(Book.isbn)).scalar() // 10)
+
+    def search_term(rng):
+        word = rng.choice(rng.choice(titles).split())
+        if len(word) > 4:
+            i = rng.randrange(1, len(word) - 1)
+            word = word[:i] + word[i + 1:]  # drop a letter: typo tolerance
+        return word
+
+    borrowed = []
+    borrowed_lock = threading.Lock()
+
+    def borrow(c, rng):
+        response = c.post('/borrows/', json={'book_isbn': rng.choice(isbns)}, headers=member)
+        if response.status_code == 201:
+            with borrowed_lock:
+                borrowed.append(response.get_json()['data']['id'])
+        return response
+
+    def give_back(c, rng):
+        with borrowed_lock:
+            borrow_id = borrowed.pop() if borrowed else None
+        if borrow_id is None:
+            borrow(c, rng)
+            with borrowed_lock:
+                borrow_id = borrowed.pop()
+        return c.post(f'/borrows/{borrow_id}/return', headers=librarian)
+
+    available = {
+        'books_list': lambda c, rng: c.get(f'/books/?page={rng.randint(1, min(pages, 50))}&per_page=10'),
+        'books_cursor': lambda c, rng: c.get('/books/?per_page=10&cursor=&include_total=false'),
+        'search': lambda c, rng: c.get(f'/books/?q={search_term(rng)}&per_page=10'),
+        'book_detail': lambda c, rng: c.get(f'/books/{rng.choice(isbns)}'),
+        'login': lambda c, rng: c.post('/auth/login', json={'email': 'john.doe@email.com', 'password': 'member123'}),
+        'borrow': borrow,
+        'return': give_back,
+        'unreturned': lambda c, rng: c.get('/borrows/unreturned?per_page=20', headers=librarian),
+    }
+    unknown = set(names) - set(available)
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    return [Scenario(name, available[name]) for name in names]
+
+
+def run_scenario(app, scenario, requests, warmup, concurrency, seed):
+    samples = []
+    statuses = {}
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker(index):
+        client = app.test_client()
+        rng = random.Random(seed * 1000 + index)
+        for _ in range(warmup // concurrency):
+            scenario.request(client, rng)
+        barrier.wait()
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            started = time.perf_counter()
+            response = scenario.request(client, rng)
+            elapsed = (time.perf_counter() - started) * 1000
+            timing = _SERVER_TIMING.search(', '.join(response.headers.getlist('Server-Timing')))
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                samples.append((elapsed, int(timing.group(2)) if timing else None,
+                                float(timing.group(1)) if timing else None))
+
+    barrier = threading.Barrier(concurrency + 1)
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies = sorted(sample[0] for sample in samples)
+    queries = [sample[1] for sample in samples if sample[1] is not None]
+    db_ms = [sample[2] for sample in samples if sample[2] is not None]
+    errors = sum(n for status, n in statuses.items() if status >= 400)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'status_counts': {str(k): v for k, v in sorted(statuses.items())},
+        'throughput_rps': round(len(samples) / wall, 2) if wall else None,
+        'latency_ms': {
+            'min': round(latencies[0], 3),
+            'mean': round(statistics.fmean(latencies), 3),
+            'p50': round(percentile(latencies, 50), 3),
+            'p90': round(percentile(latencies, 90), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'max': round(latencies[-1], 3),
+        },
+        'queries_per_request': {
+            'mean': round(statistics.fmean(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+        'db_ms_mean': round(statistics.fmean(db_ms), 3) if db_ms else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous_path):
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    print(f"\nChange vs {previous_path} ({previous['meta'].get('git_commit')}):")
+    print(f"{'scenario':<14}{'p50 ms':>26}{'p95 ms':>26}{'rps':>26}{'queries':>20}")
+    for name, result in current['scenarios'].items():
+        before = previous['scenarios'].get(name)
+        if not before:
+            continue
+
+        def delta(now, then):
+            if now is None or then is None:
+                return '-'
+            change = f'{(now - then) / then * 100:+.0f}%' if then else ''
+            return f'{then:g}->{now:g} {change}'
+
+        print(
+            f"{name:<14}"
+            f"{delta(result['latency_ms']['p50'], before['latency_ms']['p50']):>26}"
+            f"{delta(result['latency_ms']['p95'], before['latency_ms']['p95']):>26}"
+            f"{delta(result['throughput_rps'], before['throughput_rps']):>26}"
+            f"{delta(result['queries_per_request']['mean'], before['queries_per_request']['mean']):>20}"
+        )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    database = configure_environment(args)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    print(f"Seeding {database} ...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed(app, args.books, args.borrows)
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    scenarios = build_scenarios(app, names)
+    with app.app_context():
+        dialect = db.engine.dialect.name
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': dialect,
+            'books': args.books,
+            'borrows': args.borrows,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'cache': not args.no_cache,
+            'bcrypt_rounds': args.bcrypt_rounds,
+        },
+        'scenarios': {},
+    }
+    print(f"{'scenario':<14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>10}{'queries':>9}{'errors':>8}")
+    # Keep per-request logging and prints out of the timings and the table.
+    logging.disable(logging.WARNING)
+    for scenario in scenarios:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_scenario(app, scenario, args.requests, args.warmup, args.concurrency, args.seed)
+        results['scenarios'][scenario.name] = result
+        latency = result['latency_ms']
+        print(
+            f"{scenario.name:<14}{latency['p50']:>10.2f}{latency['p95']:>10.2f}{latency['p99']:>10.2f}"
+            f"{result['throughput_rps']:>10.1f}{result['queries_per_request']['mean'] or 0:>9.1f}"
+            f"{result['errors']:>8}"
+        )
+
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,19 +9,123 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Optional read replica for read-only catalog and report queries
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    SQLALCHEMY_BINDS = {"replica": DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", 2))
+
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES'))
 
     BORROWING_LIMIT_DAYS = int(os.getenv('BORROWING_LIMIT_DAYS', 14))
+    # Days a returned copy is held for the next reservation before it moves on
+    RESERVATION_HOLD_DAYS = int(os.getenv('RESERVATION_HOLD_DAYS', 3))
+
+    # Rows per executemany batch for POST /books/bulk
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv('BULK_IMPORT_CHUNK_SIZE', 1000))
+
+    # Backend Google Books lookups (POST /books/import/isbns)
+    GOOGLE_BOOKS_API_URL = os.getenv('GOOGLE_BOOKS_API_URL', 'https://www.googleapis.com/books/v1/volumes')
+    GOOGLE_BOOKS_API_KEY = os.getenv('GOOGLE_BOOKS_API_KEY')
+    GOOGLE_BOOKS_CACHE_DIR = os.getenv('GOOGLE_BOOKS_CACHE_DIR')
+    GOOGLE_BOOKS_CACHE_TTL = int(os.getenv('GOOGLE_BOOKS_CACHE_TTL', 30 * 86400))
+    GOOGLE_BOOKS_CACHE_MISS_TTL = int(os.getenv('GOOGLE_BOOKS_CACHE_MISS_TTL', 86400))
+    GOOGLE_BOOKS_MAX_WORKERS = int(os.getenv('GOOGLE_BOOKS_MAX_WORKERS', 8))
+    GOOGLE_BOOKS_PER_HOST_LIMIT = int(os.getenv('GOOGLE_BOOKS_PER_HOST_LIMIT', 4))
+    GOOGLE_BOOKS_MAX_RETRIES = int(os.getenv('GOOGLE_BOOKS_MAX_RETRIES', 3))
+    GOOGLE_BOOKS_TIMEOUT = int(os.getenv('GOOGLE_BOOKS_TIMEOUT', 10))
+
+    # Password hashing: bcrypt cost and the bounded pool it runs in
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv('PASSWORD_HASH_QUEUE_DEPTH', 8))
+    PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
 
     JSON_SORT_KEYS = False
+    # 'auto' uses orjson when installed; 'orjson', 'stdlib' or 'package.module:ClassName'
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+
+    # Prometheus /metrics endpoint (set PROMETHEUS_MULTIPROC_DIR for multi-process servers)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('true', '1')
+
+    # Background jobs (flask jobs worker / flask jobs scheduler)
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 5))
+    JOB_BATCH_SIZE = int(os.getenv('JOB_BATCH_SIZE', 20))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+    JOB_RETRY_BACKOFF = int(os.getenv('JOB_RETRY_BACKOFF', 30))
+    JOB_LOCK_TIMEOUT = int(os.getenv('JOB_LOCK_TIMEOUT', 300))
+    JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', 30))
+    REMINDER_SCAN_INTERVAL = int(os.getenv('REMINDER_SCAN_INTERVAL', 3600))
+    REMINDER_SCAN_BATCH_SIZE = int(os.getenv('REMINDER_SCAN_BATCH_SIZE', 500))
+    REMINDER_DUE_SOON_DAYS = int(os.getenv('REMINDER_DUE_SOON_DAYS', 2))
+    NOTIFICATION_SENDER = os.getenv('NOTIFICATION_SENDER', 'log')
+    NOTIFICATION_FILE = os.getenv('NOTIFICATION_FILE')
+
+    # Negotiated response compression; zstd and br need the zstandard and Brotli packages
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() in ('true', '1')
+    COMPRESSION_ALGORITHMS = os.getenv('COMPRESSION_ALGORITHMS', 'zstd,br,gzip')
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv('COMPRESSION_BROTLI_LEVEL', 4))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', 3))
+
+    # Per-request SQL counters in Server-Timing headers and logs, with N+1 warnings
+    SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', 'false').lower() in ('true', '1')
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 5))
+
+    # In-process cache for reference data; a TTL of 0 disables that namespace
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+    CACHE_TTLS = {
+        'authors': int(os.getenv('CACHE_TTL_AUTHORS', 300)),
+        'categories': int(os.getenv('CACHE_TTL_CATEGORIES', 300)),
+        'books': int(os.getenv('CACHE_TTL_BOOKS', 60)),
+        'users': int(os.getenv('CACHE_TTL_USERS', 60)),
+    }
+
+    # Cache-Control sent with conditional GET responses, per blueprint name
+    HTTP_CACHE_CONTROL = {
+        'default': os.getenv('CACHE_CONTROL_DEFAULT', 'no-cache'),
+        'books': os.getenv('CACHE_CONTROL_BOOKS', 'public, max-age=0, must-revalidate'),
+        'authors': os.getenv('CACHE_CONTROL_AUTHORS', 'public, max-age=60, must-revalidate'),
+        'categories': os.getenv('CACHE_CONTROL_CATEGORIES', 'public, max-age=60, must-revalidate'),
+    }
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
+
+def _engine_options(database_url):
+    """Pool settings for one worker process.
+
+    Every gunicorn worker has its own pool and each of its WEB_THREADS threads
+    holds at most one connection, so the pool defaults to the thread count.
+    The server can open up to WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    connections in total, which has to fit in the database's max_connections.
+    """
+    threads = int(os.getenv('WEB_THREADS', 4))
+    options = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', threads)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 2)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('true', '1'),
+    }
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+    if database_url and database_url.startswith('postgresql') and statement_timeout > 0:
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+
+class ProductionConfig(Config):
+    DEBUG = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(Config.SQLALCHEMY_DATABASE_URI)
+
+
 config = {
-    "default": DevelopmentConfig
+    "default": DevelopmentConfig,
+    "development": DevelopmentConfig,
+    "production": ProductionConfig
 }
 
 def get_config(config_name=None):
-    return config.get(config_name, config["default"])
\ No newline at end of file
+    return config.get(config_name or os.getenv("FLASK_ENV"), config["default"])
\ No newline at end of file
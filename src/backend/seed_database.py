@@ -2,10 +2,19 @@
 """
 Database seeding script for Quill Library Management System
 Creates initial admin, librarian, authors, categories, and sample books
+
+With --scale it also generates a large synthetic catalog, members and borrow
+history for performance testing, e.g. ``python seed_database.py --scale 0.1``.
 """
 
+import argparse
+import csv
+import io
+import random
 import sys
 import os
+import time
+from datetime import datetime, timedelta, timezone
 
 # Add the parent directory to the path so we can import from run.py
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,7 +24,11 @@ from app.models.user import User, UserRole
 from app.models.author import Author
 from app.models.category import Category
 from app.models.book import Book
-from app.extensions import db
+from app.models.borrow import Borrow
+from app.models.table_version import bump_versions
+from app.extensions import db, bcrypt
+from app.common.hashing import password_hashing
+from sqlalchemy import case, func, text, update
 
 def seed_database():
     """Seed the database with initial data"""
@@ -176,5 +189,301 @@ def seed_database():
             db.session.rollback()
             raise
 
+
+# Rows generated at --scale 1; other scales multiply these.
+SCALE_ROWS = {'books': 1_000_000, 'members': 300_000, 'borrows': 20_000_000}
+SCALE_PASSWORD = 'member123'
+SCALE_EMAIL_DOMAIN = 'members.quill.test'
+HISTORY_DAYS = 730
+# Loans that came due this recently may still be out; older ones were all returned.
+OVERDUE_WINDOW_DAYS = 90
+
+FIRST_NAMES = [
+    'Ada', 'Omar', 'Lina', 'James', 'Sara', 'Youssef', 'Emma', 'Karim', 'Nora', 'Lucas',
+    'Maya', 'Hassan', 'Olivia', 'Mateo', 'Layla', 'Noah', 'Chloe', 'Ali', 'Grace', 'Samir',
+    'Isla', 'Daniel', 'Mona', 'Leo', 'Hana', 'Ethan', 'Zara', 'Adam', 'Ines', 'Victor',
+]
+LAST_NAMES = [
+    'Smith', 'Hassan', 'Garcia', 'Nakamura', 'Okafor', 'Rossi', 'Novak', 'Khan', 'Silva', 'Moreau',
+    'Ibrahim', 'Larsen', 'Kowalski', 'Chen', 'Haddad', 'Fischer', 'Brown', 'Mansour', 'Petrov', 'Walsh',
+    'Costa', 'Sato', 'Nasser', 'Murphy', 'Dubois', 'Farouk', 'Jensen', 'Lopez', 'Adel', 'Wright',
+]
+TITLE_WORDS = [
+    'Silent', 'River', 'Glass', 'Empire', 'Winter', 'Garden', 'Shadow', 'Harbor', 'Iron', 'Letters',
+    'Storm', 'Orchard', 'Night', 'Atlas', 'Crown', 'Ember', 'Desert', 'Lantern', 'Mirror', 'Salt',
+    'Tide', 'Thorn', 'Paper', 'Northern', 'Hidden', 'Last', 'Distant', 'Broken', 'Golden', 'Quiet',
+    'Kingdom', 'Island', 'Memory', 'Signal', 'Machine', 'House', 'Road', 'City', 'Stone', 'Light',
+]
+GENRES = [
+    'Literary Fiction', 'Thriller', 'Romance', 'Poetry', 'Travel', 'Cooking', 'Philosophy',
+    'Psychology', 'Economics', 'Art', 'Music', 'Religion', 'Politics', 'Education', 'Health',
+    'Sports', 'Graphic Novels', 'Horror', 'Drama', 'Humor',
+]
+
+
+def zipf_cum_weights(n, s):
+    """Cumulative weights of a Zipf distribution with exponent s over ranks 1..n."""
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, n + 1):
+        total += rank ** -s
+        cum_weights.append(total)
+    return cum_weights
+
+
+def isbn13(n):
+    """The n-th synthetic ISBN-13 (979-8 prefix) with a valid check digit."""
+    digits = f'9798{n:08d}'
+    check = (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits)) % 10) % 10
+    return f'979-8-{digits[4:8]}-{digits[8:]}-{check}'
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BulkLoader:
+    """Appends rows to tables over one raw DBAPI connection.
+
+    PostgreSQL gets COPY ... FROM STDIN in CSV, SQLite executemany. Every
+    chunk is committed on its own, so memory stays flat at any row count.
+    """
+
+    def __init__(self, engine, chunk_size):
+        self.dialect = engine.dialect.name
+        if self.dialect not in ('postgresql', 'sqlite'):
+            raise NotImplementedError('Bulk loading needs PostgreSQL or SQLite')
+        self.chunk_size = chunk_size
+        self.connection = engine.raw_connection()
+        cursor = self.connection.cursor()
+        if self.dialect == 'postgresql':
+            cursor.execute('SET statement_timeout = 0')
+        else:
+            cursor.execute('PRAGMA synchronous = OFF')
+        cursor.close()
+
+    def timestamp(self, value):
+        # The same text SQLAlchemy writes for DateTime columns on each backend.
+        if value is None:
+            return None
+        if self.dialect == 'postgresql':
+            return value.isoformat()
+        return value.replace(tzinfo=None).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+    def load(self, table, columns, rows):
+        started = time.perf_counter()
+        count = 0
+        cursor = self.connection.cursor()
+        for chunk in _chunks(rows, self.chunk_size):
+            if self.dialect == 'postgresql':
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(chunk)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+            else:
+                placeholders = ', '.join('?' for _ in columns)
+                cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", chunk)
+            self.connection.commit()
+            count += len(chunk)
+        cursor.close()
+        elapsed = time.perf_counter() - started
+        print(f"   • {table}: {count:,} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+        return count
+
+    def analyze(self):
+        cursor = self.connection.cursor()
+        cursor.execute('ANALYZE')
+        self.connection.commit()
+        cursor.close()
+
+    def close(self):
+        self.connection.close()
+
+
+def _generate_books(rng, count, author_ids, category_ids, popularity_rank):
+    author_weights = zipf_cum_weights(len(author_ids), 0.8)
+    category_weights = zipf_cum_weights(len(category_ids), 1.0)
+    for n in range(count):
+        title = ' '.join(rng.sample(TITLE_WORDS, rng.randint(2, 4)))
+        if rng.random() < 0.4:
+            title = f'The {title}'
+        author_id = rng.choices(author_ids, cum_weights=author_weights)[0]
+        category_id = rng.choices(category_ids, cum_weights=category_weights)[0]
+        # The top 1% of titles get several copies, the long tail just one.
+        copies = max(1, round(10 / (1 + popularity_rank[n] * 100 / count)))
+        yield (isbn13(n), title, None, copies, copies, None, author_id, category_id)
+
+
+def _generate_borrows(loader, rngs, count, member_ids, isbns, now, loan_days, overdue_ratio):
+    """Borrows in chronological order over the last HISTORY_DAYS.
+
+    Books and members are drawn from Zipf distributions, so a few titles and
+    readers account for most loans. Loans still inside their loan period are
+    mostly open; loans that came due within OVERDUE_WINDOW_DAYS stay open
+    (overdue) with probability ``overdue_ratio``; everything else was returned,
+    some of it late.
+    """
+    book_weights = zipf_cum_weights(len(isbns), 1.0)
+    member_weights = zipf_cum_weights(len(member_ids), 0.7)
+    books, members, dates = rngs
+    start = now - timedelta(days=HISTORY_DAYS)
+    step = HISTORY_DAYS * 86400 / count
+    loan = timedelta(days=loan_days)
+    overdue_after = now - timedelta(days=OVERDUE_WINDOW_DAYS)
+    for k in range(count):
+        borrowed = start + timedelta(seconds=(k + dates.random()) * step)
+        due = borrowed + loan
+        if due > now:
+            returned = None if dates.random() < 0.6 else borrowed + (now - borrowed) * dates.random()
+        elif due > overdue_after and dates.random() < overdue_ratio:
+            returned = None
+        else:
+            returned = min(borrowed + loan * dates.uniform(0.05, 1.3), now)
+        yield (
+            loader.timestamp(borrowed),
+            loader.timestamp(due),
+            loader.timestamp(returned),
+            members.choices(member_ids, cum_weights=member_weights)[0],
+            books.choices(isbns, cum_weights=book_weights)[0],
+        )
+
+
+def seed_scale(scale=1.0, seed=42, books=None, members=None, borrows=None,
+               overdue_ratio=0.1, chunk_size=10_000):
+    """Seed the sample data, then bulk-load a synthetic dataset of the given scale.
+
+    The same seed always produces the same rows; dates are relative to
+    midnight UTC on the day of seeding.
+    """
+    counts = {name: max(1, int(rows * scale)) for name, rows in SCALE_ROWS.items()}
+    for name, override in (('books', books), ('members', members), ('borrows', borrows)):
+        if override is not None:
+            counts[name] = override
+
+    seed_database()
+    app = create_app()
+
+    with app.app_context():
+        try:
+            if User.query.filter(User.email.like(f'%@{SCALE_EMAIL_DOMAIN}')).first():
+                print("⚠️  Synthetic data already loaded. Skipping to avoid duplicates.")
+                return
+
+            print(f"\n🔄 Generating {counts['books']:,} books, {counts['members']:,} members "
+                  f"and {counts['borrows']:,} borrows (seed {seed})...")
+            now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+            rng = random.Random(seed)
+            loader = BulkLoader(db.engine, chunk_size)
+
+            for name in GENRES:
+                if not Category.query.filter_by(name=name).first():
+                    db.session.add(Category(name))
+            db.session.commit()
+            category_ids = [category_id for (category_id,) in db.session.query(Category.id).order_by(Category.id)]
+            rng.shuffle(category_ids)
+
+            first_author = (db.session.query(func.max(Author.id)).scalar() or 0) + 1
+            author_ids = list(range(first_author, first_author + max(1, counts['books'] // 10)))
+            loader.load('authors', ('id', 'name'), (
+                (author_id, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}') for author_id in author_ids
+            ))
+            rng.shuffle(author_ids)
+
+            # popularity_rank[n] is book n's place in the borrow distribution.
+            by_popularity = list(range(counts['books']))
+            rng.shuffle(by_popularity)
+            popularity_rank = [0] * counts['books']
+            for rank, n in enumerate(by_popularity):
+                popularity_rank[n] = rank
+            loader.load(
+                'books',
+                ('isbn', 'title', 'cover', 'total_copies', 'available_copies', 'description', 'author_id', 'category_id'),
+                _generate_books(random.Random(seed + 1), counts['books'], author_ids, category_ids, popularity_rank)
+            )
+
+            # One hash shared by every generated member: bcrypt is far too slow to run per row.
+            password = password_hashing.run(bcrypt.generate_password_hash, SCALE_PASSWORD).decode('utf-8')
+            first_member = (db.session.query(func.max(User.id)).scalar() or 0) + 1
+            member_ids = list(range(first_member, first_member + counts['members']))
+            loader.load('users', ('id', 'name', 'email', 'password', 'role', 'token_version'), (
+                (member_id, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                 f'member{n:07d}@{SCALE_EMAIL_DOMAIN}', password, UserRole.member.name, 0)
+                for n, member_id in enumerate(member_ids)
+            ))
+            rng.shuffle(member_ids)
+
+            # Each draw gets its own stream so the rows do not depend on chunk size.
+            borrow_rngs = tuple(random.Random(seed + offset) for offset in (2, 3, 4))
+            loader.load('borrows', ('borrow_date', 'due_date', 'return_date', 'user_id', 'book_isbn'), _generate_borrows(
+                loader, borrow_rngs, counts['borrows'], member_ids,
+                [isbn13(n) for n in by_popularity], now, app.config['BORROWING_LIMIT_DAYS'], overdue_ratio
+            ))
+
+            print("🔧 Updating counters, sequences and report rollups...")
+            if loader.dialect == 'postgresql':
+                db.session.execute(text('SET statement_timeout = 0'))
+                for table in ('authors', 'users'):
+                    db.session.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                    ))
+
+            # Popular titles may have more loans open than copies; buy enough copies.
+            active = (
+                db.session.query(Borrow.book_isbn, func.count(Borrow.id).label('active'))
+                .filter(Borrow.return_date.is_(None))
+                .group_by(Borrow.book_isbn)
+                .subquery()
+            )
+            total = case((Book.total_copies < active.c.active, active.c.active), else_=Book.total_copies)
+            db.session.execute(
+                update(Book)
+                .where(Book.isbn == active.c.book_isbn)
+                .values(total_copies=total, available_copies=total - active.c.active)
+                .execution_options(synchronize_session=False)
+            )
+            bump_versions(db.session.connection(), {'authors', 'categories', 'books', 'users', 'borrows'})
+            db.session.commit()
+
+            from app.services import book_service, report_service
+            book_service.reconcile_available_copies(fix=True)
+            report_service.backfill_rollups()
+            loader.analyze()
+            loader.close()
+
+            print("\n✅ Synthetic data loaded!")
+            print(f"   • Members log in as member0000000@{SCALE_EMAIL_DOMAIN} ... with password {SCALE_PASSWORD}")
+            print(f"   • Open borrows: {Borrow.query.filter(Borrow.return_date.is_(None)).count():,}")
+
+        except Exception as e:
+            print(f"\n❌ Error while loading synthetic data: {str(e)}")
+            db.session.rollback()
+            raise
+
+
 if __name__ == '__main__':
-    seed_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Seed the Quill database.')
+    parser.add_argument('--scale', type=float,
+                        help='also generate synthetic data; 1 = 1M books, 300k members, 20M borrows')
+    parser.add_argument('--books', type=int, help='number of generated books (overrides --scale)')
+    parser.add_argument('--members', type=int, help='number of generated members (overrides --scale)')
+    parser.add_argument('--borrows', type=int, help='number of generated borrows (overrides --scale)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--overdue-ratio', type=float, default=0.1,
+                        help='share of recently due loans that are still out (default: 0.1)')
+    parser.add_argument('--chunk-size', type=int, default=10_000, help='rows per COPY/executemany batch')
+    args = parser.parse_args()
+
+    if args.scale is None and any(v is not None for v in (args.books, args.members, args.borrows)):
+        parser.error('--books, --members and --borrows need --scale')
+    if args.scale is None:
+        seed_database()
+    else:
+        seed_scale(args.scale, args.seed, args.books, args.members, args.borrows,
+                   args.overdue_ratio, args.chunk_size)
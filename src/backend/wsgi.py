@@ -0,0 +1,5 @@
+import os
+from app import create_app
+
+# Entry point for production servers: gunicorn -c gunicorn.conf.py wsgi:app
+app = create_app(os.getenv("FLASK_ENV", "production"))
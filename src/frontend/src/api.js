@@ -37,7 +37,8 @@ export const updateBook = (isbn, payload) => {
 }
 export const deleteBook = (isbn) => api.delete(`/books/${isbn}`)
 // Authors
-export const getAuthors = () => api.get('/authors/')
+// /authors/ is paginated: data is { authors, pagination }. Pickers search it by name prefix.
+export const getAuthors = (params = {}) => api.get('/authors/', { params })
 export const createAuthor = (payload) => api.post('/authors/', payload)
 export const updateAuthor = (id, payload) => api.put(`/authors/${id}`, payload)
 export const deleteAuthor = (id) => api.delete(`/authors/${id}`)
@@ -1,8 +1,9 @@
 import React, { useState } from 'react'
 import Table from './ui/Table'
 import Pagination from './ui/Pagination'
+import AuthorPicker from './common/AuthorPicker'
 
-function BooksSection({ books, pagination, authors, categories, loading, onBooksUpdate, onBooksUpdateEdit, onSearchBooks, onPageChange }){
+function BooksSection({ books, pagination, categories, loading, onBooksUpdate, onBooksUpdateEdit, onSearchBooks, onPageChange }){
   const [searchQuery, setSearchQuery] = useState('')
   const [authorFilter, setAuthorFilter] = useState('')
   const [categoryFilter, setCategoryFilter] = useState('')
@@ -30,16 +31,13 @@ function BooksSection({ books, pagination, authors, categories, loading, onBooks
           onChange={e => setSearchQuery(e.target.value)}
           aria-label="Search books by title"
         />
-        <select
+        <AuthorPicker
           value={authorFilter}
+          valueKey="name"
           onChange={e => setAuthorFilter(e.target.value)}
-          aria-label="Filter by author"
-        >
-          <option value="">All Authors</option>
-          {authors.map(author => (
-            <option key={author.id} value={author.name}>{author.name}</option>
-          ))}
-        </select>
+          emptyLabel="All Authors"
+          ariaLabel="Filter by author"
+        />
         <select
           value={categoryFilter}
           onChange={e => setCategoryFilter(e.target.value)}
@@ -0,0 +1,43 @@
+import React, { useState } from 'react'
+import { useAuthorSearch } from '../../hooks/useAuthorSearch'
+
+/**
+ * AuthorPicker Component
+ * Author select narrowed by a typed name prefix, so it reaches every author
+ * without loading them all. `valueKey` picks what the select submits.
+ */
+function AuthorPicker({ id, name, value, valueKey = 'id', initialAuthor = null, onChange, required, emptyLabel = 'Select Author', ariaLabel = 'Author' }){
+  const [prefix, setPrefix] = useState('')
+  const [chosen, setChosen] = useState(initialAuthor)
+  const authors = useAuthorSearch(prefix)
+
+  // Keep the current choice listed even when it falls outside the search.
+  const options = chosen && !authors.some(a => a.id === chosen.id) ? [chosen, ...authors] : authors
+
+  const handleSelect = (e) => {
+    setChosen(options.find(a => String(a[valueKey]) === e.target.value) || null)
+    if (onChange) onChange(e)
+  }
+
+  const selectValue = value !== undefined ? value : (chosen ? chosen[valueKey] : '')
+
+  return (
+    <div className="author-picker">
+      <input
+        type="search"
+        value={prefix}
+        onChange={e => setPrefix(e.target.value)}
+        placeholder="Find author..."
+        aria-label="Find author by name"
+      />
+      <select id={id} name={name} value={selectValue} onChange={handleSelect} required={required} aria-label={ariaLabel}>
+        <option value="">{emptyLabel}</option>
+        {options.map(author => (
+          <option key={author.id} value={author[valueKey]}>{author.name}</option>
+        ))}
+      </select>
+    </div>
+  )
+}
+
+export default AuthorPicker
@@ -1,6 +1,7 @@
 import React from 'react'
+import AuthorPicker from './AuthorPicker'
 
-function SearchFilters({ query, authorFilter, categoryFilter, authors, categories, onQueryChange, onAuthorFilterChange, onCategoryFilterChange, onSearch, onClear, placeholder = "Search by title" }){
+function SearchFilters({ query, authorFilter, categoryFilter, categories, onQueryChange, onAuthorFilterChange, onCategoryFilterChange, onSearch, onClear, placeholder = "Search by title" }){
   return (
     <div className="search-filters">
       <input
@@ -10,16 +11,13 @@ function SearchFilters({ query, authorFilter, categoryFilter, authors, categorie
         onChange={e => onQueryChange(e.target.value)}
         aria-label="Search books"
       />
-      <select
+      <AuthorPicker
         value={authorFilter}
+        valueKey="name"
         onChange={e => onAuthorFilterChange(e.target.value)}
-        aria-label="Filter by author"
-      >
-        <option value="">All Authors</option>
-        {authors.map(author => (
-          <option key={author.id} value={author.name}>{author.name}</option>
-        ))}
-      </select>
+        emptyLabel="All Authors"
+        ariaLabel="Filter by author"
+      />
       <select
         value={categoryFilter}
         onChange={e => onCategoryFilterChange(e.target.value)}
@@ -1,6 +1,7 @@
 import React, { useState } from 'react'
+import AuthorPicker from '../common/AuthorPicker'
 
-function BookForm({ onSubmit, onCancel, categories, authors }){
+function BookForm({ onSubmit, onCancel, categories }){
   const handleSubmit = async (e) => {
     e.preventDefault()
     const form = e.target
@@ -22,10 +23,7 @@ function BookForm({ onSubmit, onCancel, categories, authors }){
       <div className="form-grid">
         <input name="isbn" placeholder="ISBN" required />
         <input name="title" placeholder="Title" required />
-        <select name="author_id" required>
-          <option value="">Select Author</option>
-          {authors.map(a => <option key={a.id} value={a.id}>{a.name}</option>)}
-        </select>
+        <AuthorPicker name="author_id" required />
         <select name="category_id" required>
           <option value="">Select Category</option>
           {categories.map(c => <option key={c.id} value={c.id}>{c.name}</option>)}
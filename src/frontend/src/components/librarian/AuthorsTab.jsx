@@ -1,14 +1,55 @@
-import React, { useState } from 'react'
+import React, { useEffect, useState, useCallback } from 'react'
 import Table from '../ui/Table'
-import { createAuthor, deleteAuthor } from '../../api'
+import Pagination from '../ui/Pagination'
+import { getAuthors, createAuthor, deleteAuthor } from '../../api'
 
 /**
  * AuthorsTab Component
- * Manages adding and deleting authors
+ * Manages adding and deleting authors, one page of the list at a time
  */
-export default function AuthorsTab({ authors, onDataUpdate, showSuccess, showError }) {
+export default function AuthorsTab({ onDataUpdate, showSuccess, showError }) {
   const [newAuthorName, setNewAuthorName] = useState('')
   const [isSubmitting, setIsSubmitting] = useState(false)
+  const [authors, setAuthors] = useState([])
+  const [pagination, setPagination] = useState({ page: 1, total_items: 0 })
+  const [page, setPage] = useState(1)
+  const [search, setSearch] = useState('')
+  const [prefix, setPrefix] = useState('')
+
+  const loadAuthors = useCallback(async () => {
+    try {
+      const params = { page, per_page: 20 }
+      if (prefix) params.prefix = prefix
+      const res = await getAuthors(params)
+      const data = res.data.data || res.data
+      setAuthors(data.authors || [])
+      setPagination(data.pagination || {})
+    } catch (err) {
+      const message =
+        err.response?.data?.data?.description ||
+        err.response?.data?.message ||
+        'Failed to load authors'
+      showError(message)
+    }
+  }, [page, prefix, showError])
+
+  useEffect(() => {
+    loadAuthors()
+  }, [loadAuthors])
+
+  // Debounce search to avoid API calls on every keystroke
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setPrefix(search.trim())
+      setPage(1)
+    }, 300)
+    return () => clearTimeout(timer)
+  }, [search])
+
+  const refresh = () => {
+    loadAuthors()
+    if (onDataUpdate) onDataUpdate()
+  }
 
   const handleAddAuthor = async (e) => {
     e.preventDefault()
@@ -19,7 +60,7 @@ export default function AuthorsTab({ authors, onDataUpdate, showSuccess, showErr
       await createAuthor({ name: newAuthorName.trim() })
       showSuccess('Author added successfully')
       setNewAuthorName('')
-      onDataUpdate()
+      refresh()
     } catch (err) {
       const message =
         err.response?.data?.data?.description ||
@@ -36,7 +77,7 @@ export default function AuthorsTab({ authors, onDataUpdate, showSuccess, showErr
       try {
         await deleteAuthor(author.id)
         showSuccess('Author deleted successfully')
-        onDataUpdate()
+        refresh()
       } catch (err) {
         const message =
           err.response?.data?.data?.description ||
@@ -68,7 +109,16 @@ export default function AuthorsTab({ authors, onDataUpdate, showSuccess, showErr
       </section>
 
       <section aria-labelledby="authors-list-heading">
-        <h3 id="authors-list-heading">Authors List ({authors.length})</h3>
+        <h3 id="authors-list-heading">Authors List ({pagination.total_items ?? authors.length})</h3>
+        <div className="search-filters">
+          <input
+            type="text"
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+            placeholder="Search by name"
+            aria-label="Search authors by name"
+          />
+        </div>
         <Table
           columns={[
             { key: 'name', title: 'Name' },
@@ -77,6 +127,7 @@ export default function AuthorsTab({ authors, onDataUpdate, showSuccess, showErr
           data={authors}
           onDelete={handleDeleteAuthor}
         />
+        <Pagination pagination={pagination} onPageChange={setPage} />
       </section>
     </div>
   )
@@ -1,10 +1,11 @@
 import React, { useState, useEffect } from 'react'
+import AuthorPicker from '../common/AuthorPicker'
 
 /**
  * BookEditForm Component
  * A controlled form for editing an existing book
  */
-export default function BookEditForm({ book, authors, categories, onSubmit, onCancel }) {
+export default function BookEditForm({ book, categories, onSubmit, onCancel }) {
   const [formData, setFormData] = useState(book)
 
   useEffect(() => {
@@ -51,20 +52,15 @@ export default function BookEditForm({ book, authors, categories, onSubmit, onCa
 
           <div className="form-field">
             <label htmlFor="edit-author">Author</label>
-            <select
+            <AuthorPicker
+              key={book.isbn}
               id="edit-author"
               name="author_id"
               value={formData.author_id || ''}
+              initialAuthor={book.author_id ? { id: book.author_id, name: book.author } : null}
               onChange={handleChange}
               required
-            >
-              <option value="">Select Author</option>
-              {authors.map((author) => (
-                <option key={author.id} value={author.id}>
-                  {author.name}
-                </option>
-              ))}
-            </select>
+            />
           </div>
 
           <div className="form-field">
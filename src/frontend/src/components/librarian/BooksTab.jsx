@@ -11,7 +11,6 @@ import BookEditForm from './BookEditForm'
 export default function BooksTab({
   books,
   pagination,
-  authors,
   categories,
   loading,
   onDeleteBook,
@@ -32,7 +31,6 @@ export default function BooksTab({
       {editingBook && (
         <BookEditForm
           book={editingBook}
-          authors={authors}
           categories={categories}
           onSubmit={onSaveEdit}
           onCancel={onCancelEdit}
@@ -45,7 +43,6 @@ export default function BooksTab({
         <BookForm
           onSubmit={onAddBook}
           categories={categories}
-          authors={authors}
         />
       </section>
 
@@ -60,7 +57,6 @@ export default function BooksTab({
       <BooksSection
         books={books}
         pagination={pagination}
-        authors={authors}
         categories={categories}
         loading={loading}
         onBooksUpdate={onDeleteBook}
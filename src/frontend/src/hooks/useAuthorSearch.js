@@ -0,0 +1,27 @@
+import { useState, useEffect } from 'react'
+import { getAuthors } from '../api'
+
+// Authors whose name starts with `prefix`, refetched as the user types.
+export function useAuthorSearch(prefix, limit = 20){
+  const [authors, setAuthors] = useState([])
+
+  useEffect(() => {
+    let cancelled = false
+    const timer = setTimeout(async () => {
+      try{
+        const params = { per_page: limit, fields: 'id,name', include_total: false }
+        if (prefix.trim()) params.prefix = prefix.trim()
+        const res = await getAuthors(params)
+        if (!cancelled) setAuthors(res.data.data.authors || [])
+      }catch(err){
+        console.error('Could not load authors', err)
+      }
+    }, 250)
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
+    }
+  }, [prefix, limit])
+
+  return authors
+}
@@ -14,7 +14,7 @@ export function useBooks(){
     setError(null)
     try{
       const params = { page, per_page: 12 }
-      if (title) params.title = title
+      if (title) params.q = title
       if (author) params.author = author
       if (category) params.category = category
 
@@ -19,12 +19,15 @@ import BorrowsTab from '../components/librarian/BorrowsTab'
 import BookEditForm from '../components/librarian/BookEditForm'
 import GoogleBooksImport from '../components/librarian/GoogleBooksImport'
 
+// Only the total is needed, so ask for the smallest page.
+const AUTHOR_COUNT_PARAMS = { per_page: 1, fields: 'id' }
+
 /**
  * SystemStatsTab: Shows system statistics and analytics
  */
-const SystemStatsTab = memo(({ books, authors, categories, users, borrows }) => {
+const SystemStatsTab = memo(({ books, authorCount, categories, users, borrows }) => {
   const totalBooks = books.length
-  const totalAuthors = authors.length
+  const totalAuthors = authorCount
   const totalCategories = categories.length
   const totalUsers = users.length
   const totalLibrarians = users.filter(u => u.role === 'librarian').length
@@ -373,7 +376,7 @@ export default function AdminDashboard() {
   const [tab, setTab] = useState('overview')
   const [books, setBooks] = useState([])
   const [pagination, setPagination] = useState({})
-  const [authors, setAuthors] = useState([])
+  const [authorCount, setAuthorCount] = useState(0)
   const [categories, setCategories] = useState([])
   const [users, setUsers] = useState([])
   const [borrows, setBorrows] = useState([])
@@ -388,7 +391,7 @@ export default function AdminDashboard() {
     setLoading(true)
     try {
       const [bRes, aRes, cRes, uRes, borrowsRes] = await Promise.all([
-        getBooks(), getAuthors(), getCategories(), getUsers(), fetchUnreturnedBorrows()
+        getBooks(), getAuthors(AUTHOR_COUNT_PARAMS), getCategories(), getUsers(), fetchUnreturnedBorrows()
       ])
       
       const booksData = bRes.data.data || bRes.data
@@ -396,7 +399,7 @@ export default function AdminDashboard() {
       setBooks(booksArray)
       setPagination(booksData.pagination || {})
       
-      setAuthors(aRes.data.data || aRes.data || [])
+      setAuthorCount(aRes.data.data.pagination.total_items)
       setCategories(cRes.data.data || cRes.data || [])
       setUsers(uRes.data.data || uRes.data || [])
       
@@ -416,11 +419,21 @@ export default function AdminDashboard() {
     fetchAll()
   }, [fetchAll])
 
+  // The authors tab pages its own list; only the overview count lives here.
+  const fetchAuthorCount = useCallback(async () => {
+    try {
+      const res = await getAuthors(AUTHOR_COUNT_PARAMS)
+      setAuthorCount(res.data.data.pagination.total_items)
+    } catch (err) {
+      console.error('Failed to fetch author count:', err)
+    }
+  }, [])
+
   const fetchBooks = useCallback(async (page = 1, title = '', author = '', category = '') => {
     setLoading(true)
     try {
       const params = { page, per_page: 10 }
-      if (title) params.title = title
+      if (title) params.q = title
       if (author) params.author = author
       if (category) params.category = category
 
@@ -567,7 +580,7 @@ export default function AdminDashboard() {
         return (
           <SystemStatsTab
             books={books}
-            authors={authors}
+            authorCount={authorCount}
             categories={categories}
             users={users}
             borrows={borrows}
@@ -579,7 +592,6 @@ export default function AdminDashboard() {
             {editingBook && (
               <BookEditForm
                 book={editingBook}
-                authors={authors}
                 categories={categories}
                 onSubmit={handleSaveBookUpdate}
                 onCancel={handleCancelEdit}
@@ -588,7 +600,6 @@ export default function AdminDashboard() {
             <BookForm
               onSubmit={handleAddBook}
               categories={categories}
-              authors={authors}
             />
             <GoogleBooksImport
               googleBooks={googleBooks}
@@ -598,7 +609,6 @@ export default function AdminDashboard() {
             <BooksSection
               books={books}
               pagination={pagination}
-              authors={authors}
               categories={categories}
               loading={loading}
               onBooksUpdate={handleDeleteBook}
@@ -611,8 +621,7 @@ export default function AdminDashboard() {
       case 'authors':
         return (
           <AuthorsTab
-            authors={authors}
-            onDataUpdate={fetchAll}
+            onDataUpdate={fetchAuthorCount}
             showSuccess={showSuccess}
             showError={showError}
           />
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react'
-import { getCategories, getAuthors } from '../api'
+import { getCategories } from '../api'
 import BookCard from '../components/common/BookCard'
 import Pagination from '../components/ui/Pagination'
 import SearchFilters from '../components/common/SearchFilters'
@@ -7,7 +7,6 @@ import { useBooks } from '../hooks/useBooks'
 
 export default function BooksList(){
   const [categories, setCategories] = useState([])
-  const [authors, setAuthors] = useState([])
   const [query, setQuery] = useState('')
   const [authorFilter, setAuthorFilter] = useState('')
   const [categoryFilter, setCategoryFilter] = useState('')
@@ -16,7 +15,6 @@ export default function BooksList(){
 
   useEffect(() => {
     fetchCategories()
-    fetchAuthors()
   }, [])
 
   async function fetchCategories(){
@@ -29,16 +27,6 @@ export default function BooksList(){
     }
   }
 
-  async function fetchAuthors(){
-    try{
-      const res = await getAuthors()
-      const authorsData = res.data.data || res.data || []
-      setAuthors(authorsData)
-    }catch(err){
-      console.error('Could not load authors', err)
-    }
-  }
-
   const handleSearch = () => {
     fetchBooks(1, query, authorFilter, categoryFilter)
   }
@@ -61,7 +49,6 @@ export default function BooksList(){
         query={query}
         authorFilter={authorFilter}
         categoryFilter={categoryFilter}
-        authors={authors}
         categories={categories}
         onQueryChange={setQuery}
         onAuthorFilterChange={setAuthorFilter}
@@ -1,7 +1,6 @@
 import React, { useEffect, useState, useCallback, memo } from 'react'
 import {
   getBooks, createBook, deleteBook, updateBook,
-  getAuthors, createAuthor, deleteAuthor,
   getCategories, createCategory, deleteCategory,
   getUsers, deleteUser,
   searchGoogleBooks, importBook,
@@ -12,12 +11,14 @@ import Table from '../components/ui/Table'
 import Pagination from '../components/ui/Pagination'
 import BooksSection from '../components/BooksSection'
 import BookForm from '../components/forms/BookForm'
+import AuthorPicker from '../components/common/AuthorPicker'
+import AuthorsTab from '../components/librarian/AuthorsTab'
 
 /**
  * 📚 BooksTab: Manages creating, editing, and importing books.
  */
 const BooksTab = memo(({
-  books, pagination, authors, categories, loading,
+  books, pagination, categories, loading,
   onDeleteBook, onEditBook, onSearchBooks, onPageChange,
   onAddBook, onImportBook, onSearchGoogle, googleBooks,
   editingBook, onSaveEdit, onCancelEdit
@@ -28,7 +29,6 @@ const BooksTab = memo(({
       {editingBook && (
         <BookEditForm
           book={editingBook}
-          authors={authors}
           categories={categories}
           onSubmit={onSaveEdit}
           onCancel={onCancelEdit}
@@ -40,7 +40,6 @@ const BooksTab = memo(({
       <BookForm
         onSubmit={onAddBook}
         categories={categories}
-        authors={authors}
       />
 
       {/* --- Import from Google Books --- */}
@@ -54,7 +53,6 @@ const BooksTab = memo(({
       <BooksSection
         books={books}
         pagination={pagination}
-        authors={authors}
         categories={categories}
         loading={loading}
         onBooksUpdate={onDeleteBook}
@@ -154,7 +152,7 @@ const GoogleBooksImport = memo(({ googleBooks, onSearch, onImport }) => {
 /**
  * 📝 BookEditForm: A controlled form for editing an existing book.
  */
-const BookEditForm = ({ book, authors, categories, onSubmit, onCancel }) => {
+const BookEditForm = ({ book, categories, onSubmit, onCancel }) => {
   const [formData, setFormData] = useState(book)
 
   useEffect(() => {
@@ -195,12 +193,14 @@ const BookEditForm = ({ book, authors, categories, onSubmit, onCancel }) => {
             placeholder="Title"
             required
           />
-          <select name="author_id" value={formData.author_id || ''} onChange={handleChange} required>
-            <option value="">Select Author</option>
-            {authors.map(author => (
-              <option key={author.id} value={author.id}>{author.name}</option>
-            ))}
-          </select>
+          <AuthorPicker
+            key={book.isbn}
+            name="author_id"
+            value={formData.author_id || ''}
+            initialAuthor={book.author_id ? { id: book.author_id, name: book.author } : null}
+            onChange={handleChange}
+            required
+          />
           <select name="category_id" value={formData.category_id || ''} onChange={handleChange} required>
             <option value="">Select Category</option>
             {categories.map(cat => (
@@ -238,55 +238,6 @@ const BookEditForm = ({ book, authors, categories, onSubmit, onCancel }) => {
   )
 }
 
-/**
- * 🧑‍🏫 AuthorsTab: Manages adding and deleting authors.
- */
-const AuthorsTab = memo(({ authors, onDataUpdate, showSuccess, showError }) => {
-  const [newAuthorName, setNewAuthorName] = useState('')
-
-  const handleAddAuthor = async (e) => {
-    e.preventDefault()
-    if (!newAuthorName.trim()) return
-    try {
-      await createAuthor({ name: newAuthorName.trim() })
-      showSuccess('Author added successfully')
-      setNewAuthorName('')
-      onDataUpdate()
-    } catch (err) {
-      const message = err.response?.data?.data?.description || err.response?.data?.message || 'Failed to add author'
-      showError(message)
-    }
-  }
-
-  const handleDeleteAuthor = async (a) => {
-    if (window.confirm('Delete author?')) {
-      try {
-        await deleteAuthor(a.id)
-        showSuccess('Author deleted successfully')
-        onDataUpdate()
-      } catch (err) {
-        const message = err.response?.data?.data?.description || err.response?.data?.message || 'Failed to delete author'
-        showError(message)
-      }
-    }
-  }
-
-  return (
-    <div>
-      <form onSubmit={handleAddAuthor} className="simple-form">
-        <input
-          value={newAuthorName}
-          onChange={(e) => setNewAuthorName(e.target.value)}
-          placeholder="Author name"
-          required
-        />
-        <button type="submit">Add Author</button>
-      </form>
-      <Table columns={[{ key: 'name', title: 'Name' }, { key: 'books_count', title: 'Books' }]} data={authors} onDelete={handleDeleteAuthor} />
-    </div>
-  )
-})
-
 /**
  * 🏷️ CategoriesTab: Manages adding and deleting categories.
  */
@@ -471,7 +422,6 @@ export default function LibrarianDashboard() {
   const [tab, setTab] = useState('books')
   const [books, setBooks] = useState([])
   const [pagination, setPagination] = useState({})
-  const [authors, setAuthors] = useState([])
   const [categories, setCategories] = useState([])
   const [users, setUsers] = useState([])
   const [loading, setLoading] = useState(false)
@@ -484,8 +434,8 @@ export default function LibrarianDashboard() {
   const fetchAll = useCallback(async () => {
     setLoading(true)
     try {
-      const [bRes, aRes, cRes, uRes] = await Promise.all([
-        getBooks(), getAuthors(), getCategories(), getUsers()
+      const [bRes, cRes, uRes] = await Promise.all([
+        getBooks(), getCategories(), getUsers()
       ])
       
       const booksData = bRes.data.data || bRes.data
@@ -493,7 +443,6 @@ export default function LibrarianDashboard() {
       setBooks(booksArray)
       setPagination(booksData.pagination || {})
       
-      setAuthors(aRes.data.data || aRes.data || [])
       setCategories(cRes.data.data || cRes.data || [])
       setUsers((uRes.data.data || uRes.data || []).filter(u => u.role !== 'admin' && u.role !== 'librarian'))
       
@@ -514,7 +463,7 @@ export default function LibrarianDashboard() {
     setLoading(true)
     try {
       const params = { page, per_page: 10 }
-      if (title) params.title = title
+      if (title) params.q = title
       if (author) params.author = author
       if (category) params.category = category
 
@@ -662,7 +611,6 @@ export default function LibrarianDashboard() {
           <BooksTab
             books={books}
             pagination={pagination}
-            authors={authors}
             categories={categories}
             loading={loading}
             onDeleteBook={handleDeleteBook}
@@ -681,8 +629,6 @@ export default function LibrarianDashboard() {
       case 'authors':
         return (
           <AuthorsTab
-            authors={authors}
-            onDataUpdate={fetchAll}
             showSuccess={showSuccess}
             showError={showError}
           />